@@ -1,13 +1,55 @@
 import csv
 import os
+import sys
 import json
 import time
+import threading
 import numpy as np
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from functools import lru_cache
 import random
 
+from .q_table_shards import QTableShardStore
+from .q_table_merge import MERGED_SNAPSHOT_NAME, load_merged_snapshot
+
+# Declarative issue -> state rules, evaluated top to bottom (first match wins).
+# A rule may match on an exact error_type, a substring of the lowercased
+# error_type, the severity, and/or a detail flag.
+DEFAULT_STATE_RULES = [
+    {"error_type": "service_down", "severity": "critical", "state": "service_down_critical"},
+    {"error_type": "service_down", "state": "service_degraded_performance"},
+    {"error_type": "latency_degraded", "state": "service_degraded_performance"},
+    {"error_type_contains": "database", "state": "database_connection_lost"},
+    {"detail_flag": "memory", "state": "resource_exhaustion_memory"},
+    {"detail_flag": "cpu", "state": "resource_exhaustion_cpu"},
+    {"error_type_contains": "network", "state": "network_connectivity_lost"},
+    {"error_type_contains": "deployment", "state": "deployment_failure"}
+]
+
+# Detail fields whose values are inspected for detail flags
+DEFAULT_DETAIL_FIELDS = ["status", "error", "metric", "resource"]
+
+# Detail keys that signal a flag by their presence: <flag>, <flag>_usage, ...
+DEFAULT_DETAIL_KEY_SUFFIXES = ("", "_usage", "_percentage", "_percent")
+
+# Reward shaping tables
+SEVERITY_MULTIPLIERS = {'critical': 2.0, 'high': 1.5, 'medium': 1.0, 'low': 0.5}
+IMPACT_MULTIPLIERS = {'high': 2.0, 'medium': 1.0, 'low': 0.5}
+ACTION_EFFICIENCY = {
+    'restart_service_graceful': 1.0,
+    'restart_service_force': 0.8,
+    'rollback_deployment': 0.6,
+    'manual_intervention': 0.4
+}
+DEFAULT_ACTION_EFFICIENCY = 0.7
+
+# Precompiled form of enhanced_states_actions.json, swapped as one reference
+CompiledAgentConfig = namedtuple(
+    "CompiledAgentConfig", ["config", "actions", "classify", "detail_flags", "detail_fields", "detail_keys"]
+)
+
 class AdvancedSmartAgent:
-    def __init__(self, alpha=0.1, gamma=0.95, epsilon=0.1):
+    def __init__(self, alpha=0.1, gamma=0.95, epsilon=0.1, shard_by_service=False, max_loaded_shards=64):
         # Get proper paths
         script_dir = os.path.dirname(os.path.abspath(__file__))
         self.project_root = os.path.dirname(script_dir)
@@ -22,6 +64,16 @@ class AdvancedSmartAgent:
         self.state_visit_count = defaultdict(int)
         self.action_success_history = defaultdict(list)
         
+        # Guards the tables between bus-thread updates and watcher-thread snapshot swaps
+        self.table_lock = threading.RLock()
+        self.local_updates = {}
+        
+        # Optional per-service Q-table shards (data/q_shards/<service>.csv)
+        self.shards = None
+        if shard_by_service:
+            shard_dir = os.path.join(self.project_root, "data", "q_shards")
+            self.shards = QTableShardStore(shard_dir, max_loaded=max_loaded_shards)
+        
         # Load configurations
         self.load_enhanced_config()
         self.load_q_table()
@@ -33,6 +85,7 @@ class AdvancedSmartAgent:
     def load_enhanced_config(self):
         """Load enhanced state-action mappings with granular states"""
         config_path = os.path.join(self.project_root, "data", "enhanced_states_actions.json")
+        self.config_path = config_path
         
         enhanced_config = {
             "states": {
@@ -124,6 +177,8 @@ class AdvancedSmartAgent:
                     "emergency_maintenance_mode"
                 ]
             },
+            "state_rules": DEFAULT_STATE_RULES,
+            "detail_fields": DEFAULT_DETAIL_FIELDS,
             "reward_shaping": {
                 "success_bonus": 1.0,
                 "failure_penalty": -1.0,
@@ -145,6 +200,102 @@ class AdvancedSmartAgent:
             print(f"Config error: {e}")
             self.config = enhanced_config
 
+        try:
+            compiled = self.compile_config(self.config)
+        except ValueError as e:
+            print(f"Config error: {e}, using defaults")
+            compiled = self.compile_config(enhanced_config)
+        self.apply_config(compiled)
+
+    def compile_config(self, config):
+        """Validate a config and precompile it (interned action tuples, state classifier)"""
+        actions = config.get("actions")
+        if not isinstance(actions, dict):
+            raise ValueError("'actions' must be a mapping of state -> action list")
+        compiled_actions = {}
+        for state, state_actions in actions.items():
+            if not isinstance(state_actions, list) or not all(isinstance(a, str) for a in state_actions):
+                raise ValueError(f"actions for '{state}' must be a list of strings")
+            compiled_actions[sys.intern(state)] = tuple(sys.intern(a) for a in state_actions)
+
+        rules = config.get("state_rules", DEFAULT_STATE_RULES)
+        if not isinstance(rules, list) or not all(isinstance(r, dict) and "state" in r for r in rules):
+            raise ValueError("'state_rules' must be a list of rules with a 'state'")
+        compiled_rules = tuple(
+            (
+                rule.get("error_type"),
+                rule.get("error_type_contains", "").lower() or None,
+                rule.get("severity"),
+                rule.get("detail_flag"),
+                sys.intern(rule["state"])
+            )
+            for rule in rules
+        )
+
+        @lru_cache(maxsize=1024)
+        def classify(error_type, severity, flags):
+            error_type_lower = error_type.lower()
+            for exact, contains, rule_severity, flag, state in compiled_rules:
+                if exact is not None and error_type != exact:
+                    continue
+                if contains is not None and contains not in error_type_lower:
+                    continue
+                if rule_severity is not None and severity != rule_severity:
+                    continue
+                if flag is not None and flag not in flags:
+                    continue
+                return state
+            return f"unknown_{error_type}"
+
+        detail_flags = tuple(sorted({rule[3] for rule in compiled_rules if rule[3]}))
+        configured_keys = config.get("detail_keys", {})
+        if not isinstance(configured_keys, dict):
+            raise ValueError("'detail_keys' must be a mapping of flag -> detail keys")
+        detail_keys = tuple(
+            (flag, tuple(configured_keys.get(flag, [flag + suffix for suffix in DEFAULT_DETAIL_KEY_SUFFIXES])))
+            for flag in detail_flags
+        )
+
+        return CompiledAgentConfig(
+            config=config,
+            actions=compiled_actions,
+            classify=classify,
+            detail_flags=detail_flags,
+            detail_fields=tuple(config.get("detail_fields", DEFAULT_DETAIL_FIELDS)),
+            detail_keys=detail_keys
+        )
+
+    def apply_config(self, compiled):
+        """Swap in a compiled config"""
+        self.config = compiled.config
+        self.compiled = compiled
+
+    def watch_config(self, watcher):
+        """Register the enhanced config with a ConfigWatcher for hot reload"""
+        watcher.watch(self.config_path, self.compile_config, self.apply_config, name="enhanced_states_actions.json")
+
+    def get_detail_flags(self, details, compiled=None):
+        """Return the detail flags signalled by the details payload.
+
+        Only the fixed per-flag keys (e.g. memory, memory_usage) and the
+        string values of the configured detail_fields are looked up, so the
+        cost does not grow with the payload. Matching is shallow on purpose:
+        other keys and nested values are not inspected.
+        """
+        compiled = compiled or self.compiled
+        if not details or not compiled.detail_flags:
+            return ()
+        if not isinstance(details, dict):
+            text = str(details).lower()
+            return tuple(flag for flag in compiled.detail_flags if flag in text)
+
+        values = [value.lower() for value in map(details.get, compiled.detail_fields) if isinstance(value, str)]
+        present = []
+        for flag, keys in compiled.detail_keys:
+            if any(key in details for key in keys) or any(flag in value for value in values):
+                present.append(flag)
+        return tuple(present)
+
     def load_q_table(self):
         """Load Q-table with enhanced tracking"""
         rl_table_path = os.path.join(self.project_root, "data", "enhanced_rl_table.csv")
@@ -184,35 +335,64 @@ class AdvancedSmartAgent:
         except Exception as e:
             print(f"Error saving Q-table: {e}")
 
-    def get_enhanced_state(self, issue_data):
+    def apply_merged_snapshot(self, snapshot):
+        """Adopt a fleet-wide merged Q-table (see agents/q_table_merge.py).
+
+        snapshot is (rows, merged_at). Pairs updated locally after the merge
+        started keep their local values so those updates are not lost; the
+        next merge folds them in. A snapshot without merged_at is treated as
+        older than every local update.
+        """
+        merged, merged_at = snapshot
+        if merged_at is None:
+            merged_at = float("-inf")
+        kept = 0
+        with self.table_lock:
+            for (state, action), (q_value, visit_count, _) in merged.items():
+                if self.local_updates.get((state, action), float("-inf")) > merged_at:
+                    kept += 1
+                    continue
+                self.q_table[state][action] = q_value
+                self.state_visit_count[f"{state}_{action}"] = visit_count
+            self.local_updates = {key: t for key, t in self.local_updates.items() if t > merged_at}
+            self.save_q_table()
+        print(f"🔀 Merged Q-table snapshot applied: {len(merged) - kept} state-action pairs "
+              f"({kept} newer local values kept)")
+
+    def watch_merged_snapshot(self, watcher):
+        """Pick up merged snapshots pushed next to the local Q-table"""
+        if self.shards is not None:
+            # Merged snapshots are built from whole-node tables; they do not map onto service shards
+            print("⚠️ Merged snapshot watching disabled: not supported with per-service shards")
+            return
+        snapshot_path = os.path.join(self.project_root, "data", MERGED_SNAPSHOT_NAME)
+        watcher.watch(snapshot_path, lambda snapshot: snapshot, self.apply_merged_snapshot,
+                      name=MERGED_SNAPSHOT_NAME,
+                      parser=load_merged_snapshot)
+
+    def get_enhanced_state(self, issue_data, compiled=None):
         """Convert issue data to enhanced state representation"""
+        compiled = compiled or self.compiled
         error_type = issue_data.get('error_type', 'unknown')
         severity = issue_data.get('severity', 'medium')
-        service = issue_data.get('service', 'unknown')
+        flags = self.get_detail_flags(issue_data.get('details'), compiled)
+
+        return compiled.classify(error_type, severity, flags)
+
+    def get_tables(self, issue_data):
+        """Return (q_table, visit_counts, shard) for the issue's service shard or the global table"""
+        if self.shards is None:
+            return self.q_table, self.state_visit_count, None
         
-        # Create granular state based on context
-        if error_type == 'service_down':
-            if severity == 'critical':
-                return 'service_down_critical'
-            else:
-                return 'service_degraded_performance'
-        elif 'database' in error_type.lower():
-            return 'database_connection_lost'
-        elif 'memory' in str(issue_data.get('details', {})):
-            return 'resource_exhaustion_memory'
-        elif 'cpu' in str(issue_data.get('details', {})):
-            return 'resource_exhaustion_cpu'
-        elif 'network' in error_type.lower():
-            return 'network_connectivity_lost'
-        elif 'deployment' in error_type.lower():
-            return 'deployment_failure'
-        else:
-            return f"unknown_{error_type}"
+        shard = self.shards.get(issue_data.get('service', 'unknown'))
+        return shard.q_table, shard.state_visit_count, shard
 
     def choose_action_enhanced(self, issue_data):
         """Enhanced action selection with context awareness"""
-        state = self.get_enhanced_state(issue_data)
-        available_actions = self.config["actions"].get(state, ["investigate_manual"])
+        compiled = self.compiled
+        state = self.get_enhanced_state(issue_data, compiled)
+        q_table, state_visit_count, _ = self.get_tables(issue_data)
+        available_actions = compiled.actions.get(state, ("investigate_manual",))
         
         if not available_actions:
             return "investigate_manual"
@@ -225,11 +405,11 @@ class AdvancedSmartAgent:
         best_action = None
         best_value = float('-inf')
         
-        total_visits = sum(self.state_visit_count.get(f"{state}_{a}", 0) for a in available_actions)
+        total_visits = sum(state_visit_count.get(f"{state}_{a}", 0) for a in available_actions)
         
         for action in available_actions:
-            q_value = self.q_table[state][action]
-            visit_count = self.state_visit_count.get(f"{state}_{action}", 0)
+            q_value = q_table[state][action]
+            visit_count = state_visit_count.get(f"{state}_{action}", 0)
             
             # UCB calculation
             if visit_count == 0:
@@ -253,54 +433,59 @@ class AdvancedSmartAgent:
         
         # Severity-based multiplier
         severity = issue_data.get('severity', 'medium')
-        severity_multiplier = {'critical': 2.0, 'high': 1.5, 'medium': 1.0, 'low': 0.5}.get(severity, 1.0)
+        severity_multiplier = SEVERITY_MULTIPLIERS.get(severity, 1.0)
         
         # User impact consideration
         user_impact = issue_data.get('user_impact', 'medium')
-        impact_multiplier = {'high': 2.0, 'medium': 1.0, 'low': 0.5}.get(user_impact, 1.0)
+        impact_multiplier = IMPACT_MULTIPLIERS.get(user_impact, 1.0)
         
         # Action efficiency (prefer less disruptive actions)
-        action_efficiency = {
-            'restart_service_graceful': 1.0,
-            'restart_service_force': 0.8,
-            'rollback_deployment': 0.6,
-            'manual_intervention': 0.4
-        }.get(action, 0.7)
+        action_efficiency = ACTION_EFFICIENCY.get(action, DEFAULT_ACTION_EFFICIENCY)
         
         # Calculate final shaped reward
         shaped_reward = (base_reward * severity_multiplier * impact_multiplier * action_efficiency) - time_penalty
         
         return max(shaped_reward, -2.0)  # Cap negative rewards
 
-    def update_enhanced(self, issue_data, action, result, execution_time=1.0):
+    def update_enhanced(self, issue_data, action, result, execution_time=1.0, persist=True):
         """Enhanced Q-learning update with reward shaping"""
-        state = self.get_enhanced_state(issue_data)
+        compiled = self.compiled
+        state = self.get_enhanced_state(issue_data, compiled)
+        q_table, state_visit_count, shard = self.get_tables(issue_data)
         
         # Calculate shaped reward
         reward = self.calculate_shaped_reward(issue_data, action, result, execution_time)
         
-        # Update visit count
-        state_action_key = f"{state}_{action}"
-        self.state_visit_count[state_action_key] += 1
-        
-        # Q-learning update
-        current_q = self.q_table[state][action]
-        
-        # Get max Q-value for next state (assuming same state for simplicity)
-        available_actions = self.config["actions"].get(state, [action])
-        max_next_q = max([self.q_table[state][a] for a in available_actions], default=0)
-        
-        # Q-learning formula with reward shaping
-        new_q = current_q + self.alpha * (reward + self.gamma * max_next_q - current_q)
-        self.q_table[state][action] = new_q
+        with self.table_lock:
+            # Update visit count
+            state_action_key = f"{state}_{action}"
+            state_visit_count[state_action_key] += 1
+            
+            # Q-learning update
+            current_q = q_table[state][action]
+            
+            # Get max Q-value for next state (assuming same state for simplicity)
+            available_actions = compiled.actions.get(state, (action,))
+            max_next_q = max([q_table[state][a] for a in available_actions], default=0)
+            
+            # Q-learning formula with reward shaping
+            new_q = current_q + self.alpha * (reward + self.gamma * max_next_q - current_q)
+            q_table[state][action] = new_q
+            if shard is None:
+                self.local_updates[(state, action)] = time.time()
+            
+            # Save updated table (only the touched shard when sharding)
+            if shard is not None:
+                shard.dirty = True
+                if persist:
+                    shard.save()
+            elif persist:
+                self.save_q_table()
         
         # Track performance
         self.reward_history.append(reward)
         self.action_success_history[action].append(1 if result else 0)
         
-        # Save updated table
-        self.save_q_table()
-        
         return reward
 
     def get_performance_metrics(self):
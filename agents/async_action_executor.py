@@ -0,0 +1,318 @@
+import asyncio
+import os
+import signal
+import time
+
+from .real_action_executor import RealActionExecutor, BoundedOutputBuffer
+from .remediation_plan import PlanRunner
+
+
+class AsyncCommandRunner:
+    """Runs commands with asyncio subprocesses (no shell) under a global concurrency limit"""
+
+    def __init__(self, max_concurrency=8, default_timeout=60, max_output_bytes=64 * 1024):
+        self.max_concurrency = max_concurrency
+        self.default_timeout = default_timeout
+        self.max_output_bytes = max_output_bytes
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def pump(self, stream, buffer):
+        while True:
+            chunk = await stream.read(4096)
+            if not chunk:
+                break
+            buffer.write(chunk)
+
+    async def run(self, argv, timeout=None):
+        """Run one command; returns returncode/stdout/stderr and whether it timed out"""
+        timeout = timeout or self.default_timeout
+        command = " ".join(argv)
+        stdout_buffer = BoundedOutputBuffer(self.max_output_bytes)
+        stderr_buffer = BoundedOutputBuffer(self.max_output_bytes)
+
+        async with self.semaphore:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *argv,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    start_new_session=(os.name != 'nt')
+                )
+            except (FileNotFoundError, PermissionError) as e:
+                return {"command": command, "returncode": 127, "stdout": "", "stderr": str(e),
+                        "timed_out": False, "output_truncated": False}
+
+            readers = asyncio.gather(
+                self.pump(process.stdout, stdout_buffer),
+                self.pump(process.stderr, stderr_buffer)
+            )
+            try:
+                await asyncio.wait_for(process.wait(), timeout)
+                timed_out = False
+            except asyncio.TimeoutError:
+                self.kill(process)
+                await process.wait()
+                timed_out = True
+            except asyncio.CancelledError:
+                # A cancelled remediation must not leave its command running;
+                # the readers then hit EOF and finish on their own
+                self.kill(process)
+                raise
+            await readers
+
+        stderr = stderr_buffer.getvalue()
+        if timed_out:
+            stderr += f"\nCommand timed out after {timeout}s and was killed"
+
+        return {
+            "command": command,
+            "returncode": process.returncode,
+            "stdout": stdout_buffer.getvalue(),
+            "stderr": stderr,
+            "timed_out": timed_out,
+            "output_truncated": stdout_buffer.truncated or stderr_buffer.truncated
+        }
+
+    def kill(self, process):
+        """Kill the command and everything it spawned"""
+        try:
+            if os.name != 'nt':
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+class AsyncActionExecutor(RealActionExecutor):
+    """RealActionExecutor variant whose remediations run concurrently on one event loop.
+
+    Commands are executed with create_subprocess_exec, so shell syntax
+    (pipes, redirection) in configured commands is not interpreted.
+    """
+
+    def __init__(self, max_concurrency=8):
+        super().__init__()
+        limits = self.compiled["limits"]
+        self.runner = AsyncCommandRunner(
+            max_concurrency, limits["default_timeout"], int(limits["max_output_kb"] * 1024)
+        )
+        self.async_in_flight = {}
+        self.async_waiters = {}
+
+    def command_result(self, action, success, execution_time, message, run_result, output_key="output"):
+        """Build and log a result in the same shape as the synchronous executor"""
+        result = {
+            "success": success,
+            "execution_time": execution_time,
+            "message": message
+        }
+        if success:
+            result[output_key] = run_result["stdout"]
+        else:
+            result["error"] = run_result["stderr"]
+        if run_result.get("timed_out"):
+            result["timed_out"] = True
+        if run_result.get("output_truncated"):
+            result["output_truncated"] = True
+
+        self.log_execution(action, success, result)
+        return result
+
+    async def execute_restart_service_graceful_async(self, service_name, action="restart_service_graceful"):
+        """Gracefully restart a system service"""
+        start_time = time.time()
+        print(f"🔄 Gracefully restarting {service_name}...")
+
+        timeout = self.action_timeout(action)
+        await self.runner.run(self.get_command_argv(service_name, "status_command"), timeout)
+        restart = await self.runner.run(self.get_command_argv(service_name, "restart_command"), timeout)
+
+        success = restart["returncode"] == 0
+        message = f"Service {service_name} restarted successfully" if success else f"Failed to restart {service_name}"
+        return self.command_result(action, success, time.time() - start_time, message, restart)
+
+    async def execute_scale_horizontal_async(self, service_name, target_instances=3):
+        """Scale service horizontally"""
+        start_time = time.time()
+        print(f"📈 Scaling {service_name} to {target_instances} instances...")
+
+        if not self.docker_available:
+            await asyncio.sleep(1)  # Simulate scaling time
+            result = {
+                "success": True,
+                "execution_time": time.time() - start_time,
+                "message": f"Simulated scaling {service_name} to {target_instances} instances",
+                "simulated": True
+            }
+            self.log_execution("scale_horizontal", True, result)
+            return result
+
+        scale = await self.runner.run(["docker", "service", "scale", f"{service_name}={target_instances}"],
+                                      self.action_timeout("scale_horizontal"))
+        success = scale["returncode"] == 0
+        message = f"Scaled {service_name} to {target_instances} instances" if success else f"Failed to scale {service_name}"
+        return self.command_result("scale_horizontal", success, time.time() - start_time, message, scale)
+
+    async def execute_plan_async(self, plan_name, service_name, context=None):
+        """Run a remediation plan; each step starts as soon as its dependencies succeed"""
+        context = context or {}
+        start_time = time.time()
+        plan = self.compiled["plans"][plan_name]
+        timeout = self.action_timeout(plan_name)
+        print(f"🧩 Running remediation plan {plan_name} for {service_name}...")
+
+        async def run_step(step):
+            if step.action is not None:
+                return await self.execute_action_async(step.action, dict(context, service=service_name))
+
+            run_result = await self.runner.run(step.command.argv(service=service_name), timeout)
+            return dict(run_result, success=run_result["returncode"] == 0)
+
+        # Step concurrency is bounded by the command runner's semaphore, not a worker pool
+        outcome = await PlanRunner().run_async(plan, run_step)
+
+        response = {
+            "success": outcome["success"],
+            "execution_time": time.time() - start_time,
+            "message": f"Plan {plan_name} {'completed' if outcome['success'] else 'failed'} for {service_name}",
+            "step_statuses": outcome["statuses"],
+            "steps": outcome["steps"]
+        }
+        self.log_execution(plan_name, response["success"], response)
+        return response
+
+    async def execute_rollback_deployment_async(self, service_name):
+        """Rollback to previous deployment version"""
+        print(f"⏪ Rolling back deployment for {service_name}...")
+
+        response = await self.execute_plan_async("rollback_deployment", service_name)
+        response["message"] = f"Rollback {'completed' if response['success'] else 'failed'} for {service_name}"
+        response["commands_executed"] = [step for step in response["steps"].values() if "command" in step]
+        return response
+
+    async def execute_reset_connection_pool_async(self, service_name):
+        """Reset database connection pool"""
+        start_time = time.time()
+        print(f"🔄 Resetting connection pool for {service_name}...")
+
+        if self.process_table is not None:
+            try:
+                signalled = self.process_table.refresh().signal(service_name, signal.SIGHUP)
+            except ValueError as e:
+                signalled, output = [], str(e)
+            else:
+                output = f"Sent SIGHUP to {len(signalled)} process(es): {signalled}" if signalled else f"No processes matching '{service_name}'"
+            success = bool(signalled)
+        else:
+            reload = await self.runner.run(["pkill", "-HUP", "-f", service_name], self.action_timeout("reset_connection_pool"))
+            success = reload["returncode"] == 0
+            output = reload["stdout"] if success else reload["stderr"]
+        result = {
+            "success": success,
+            "execution_time": time.time() - start_time,
+            "message": f"Connection pool reset for {service_name}",
+            "output": output
+        }
+        self.log_execution("reset_connection_pool", success, result)
+        return result
+
+    async def execute_action_async(self, action, context=None):
+        """Execute an action without blocking the event loop"""
+        context = context or {}
+        service_name = context.get('service', 'default_service')
+
+        action_map = {
+            "restart_service_graceful": lambda: self.execute_restart_service_graceful_async(service_name),
+            "restart_service_force": lambda: self.execute_restart_service_graceful_async(service_name, "restart_service_force"),
+            "scale_horizontal": lambda: self.execute_scale_horizontal_async(service_name),
+            "rollback_deployment": lambda: self.execute_rollback_deployment_async(service_name),
+            "reset_connection_pool": lambda: self.execute_reset_connection_pool_async(service_name),
+        }
+
+        if action in action_map:
+            run = action_map[action]
+        elif action in self.compiled["plans"]:
+            run = lambda: self.execute_plan_async(action, service_name, context)
+        else:
+            run = None
+
+        start_time = time.time()
+        try:
+            if run is not None:
+                cache_key = (action, service_name, self.incident_id(context))
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+                result = await self.coalesce((service_name, action), run)
+                if not result.get("coalesced"):
+                    self.result_cache.put(cache_key, result)
+                return result
+
+            # Docker SDK calls and unknown actions go through the synchronous path in a worker thread
+            return await asyncio.to_thread(self.execute_action, action, context)
+        except Exception as e:
+            result = {
+                "success": False,
+                "execution_time": time.time() - start_time,
+                "message": f"{action} failed for {service_name}: {str(e)}",
+                "error": str(e)
+            }
+            self.log_execution(action, False, result)
+            return result
+
+    async def coalesce(self, key, coroutine_fn):
+        """Attach duplicate (service, action) requests to the running task.
+
+        Waiters are counted per task; when the last one is cancelled the shared
+        task is cancelled too, so its command is killed instead of left running.
+        """
+        task = self.async_in_flight.get(key)
+        coalesced = task is not None
+        if coalesced:
+            self.in_flight.coalesced_count += 1
+        else:
+            task = asyncio.ensure_future(coroutine_fn())
+            self.async_in_flight[key] = task
+            self.async_waiters[task] = 0
+            task.add_done_callback(lambda done: (self.async_in_flight.pop(key, None),
+                                                 self.async_waiters.pop(done, None)))
+
+        self.async_waiters[task] += 1
+        try:
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done():
+                self.async_waiters[task] -= 1
+                if self.async_waiters[task] == 0:
+                    task.cancel()
+            raise
+
+        if coalesced:
+            result = dict(result)
+            result["coalesced"] = True
+        return result
+
+    async def execute_many(self, requests):
+        """Run many (action, context) remediations concurrently; results keep request order"""
+        results = await asyncio.gather(
+            *(self.execute_action_async(action, context) for action, context in requests),
+            return_exceptions=True
+        )
+        return [
+            {"success": False, "execution_time": 0, "message": f"{action} failed: {result!r}", "error": repr(result)}
+            if isinstance(result, BaseException) else result
+            for (action, _), result in zip(requests, results)
+        ]
+
+
+if __name__ == "__main__":
+    executor = AsyncActionExecutor(max_concurrency=4)
+
+    requests = [
+        ("restart_service_graceful", {"service": "web_server"}),
+        ("reset_connection_pool", {"service": "database"}),
+        ("scale_horizontal", {"service": "api_service"})
+    ]
+    for result in asyncio.run(executor.execute_many(requests)):
+        print(f"🔧 Execution Result: {result}")
@@ -0,0 +1,102 @@
+import socket
+import time
+import urllib.request
+
+DEFAULT_READINESS = {
+    "deadline": 60,
+    "initial_delay": 0.25,
+    "max_delay": 5.0,
+    "backoff": 2.0,
+    "probe_timeout": 2.0
+}
+
+TERMINAL_STATUSES = ("exited", "dead")
+
+
+def make_probe(service_config, timeout=2.0):
+    """Build an HTTP or TCP readiness probe from a deployment_config.json service entry"""
+    if not service_config:
+        return None
+
+    if service_config.get("type") == "http" and service_config.get("url"):
+        url = service_config["url"]
+
+        def http_probe():
+            try:
+                with urllib.request.urlopen(url, timeout=timeout) as response:
+                    return 200 <= response.status < 300
+            except Exception:
+                return False
+        return http_probe
+
+    if service_config.get("type") == "tcp" and service_config.get("port"):
+        address = (service_config.get("host", "localhost"), service_config["port"])
+
+        def tcp_probe():
+            try:
+                with socket.create_connection(address, timeout=timeout):
+                    return True
+            except OSError:
+                return False
+        return tcp_probe
+
+    return None
+
+
+class ReadinessWaiter:
+    """Polls a container until it is actually ready, with exponential backoff.
+
+    Ready means: status "running", Docker health check (if the image defines
+    one) reports "healthy", and the optional probe succeeds. Works with any
+    object exposing reload(), status and attrs, so a fake container can be
+    used in place of a Docker SDK one; sleep and clock are injectable.
+    """
+
+    def __init__(self, deadline=60, initial_delay=0.25, max_delay=5.0, backoff=2.0,
+                 sleep=time.sleep, clock=time.monotonic):
+        self.deadline = deadline
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.sleep = sleep
+        self.clock = clock
+
+    def container_state(self, container):
+        container.reload()
+        state = (getattr(container, "attrs", None) or {}).get("State", {})
+        health = (state.get("Health") or {}).get("Status")
+        return container.status, health
+
+    def wait(self, container, probe=None):
+        """Block until ready or the deadline passes; returns a readiness report"""
+        start = self.clock()
+        delay = self.initial_delay
+        attempts = 0
+
+        while True:
+            attempts += 1
+            status, health = self.container_state(container)
+
+            if status in TERMINAL_STATUSES:
+                return self.report(False, status, health, start, attempts, f"container {status}")
+
+            if status == "running" and health in (None, "healthy"):
+                if probe is None or probe():
+                    return self.report(True, status, health, start, attempts, "ready")
+
+            remaining = self.deadline - (self.clock() - start)
+            if remaining <= 0:
+                return self.report(False, status, health, start, attempts, "readiness deadline exceeded")
+
+            self.sleep(min(delay, remaining))
+            delay = min(delay * self.backoff, self.max_delay)
+
+    def report(self, ready, status, health, start, attempts, reason):
+        return {
+            "ready": ready,
+            "status": status,
+            "health": health,
+            "elapsed": self.clock() - start,
+            "attempts": attempts,
+            "reason": reason
+        }
@@ -0,0 +1,95 @@
+import threading
+
+
+class ContainerNotFound(LookupError):
+    """A service name has no configured container"""
+
+
+class ContainerRegistry:
+    """Resolves logical service names to containers and caches their handles.
+
+    Names are resolved only through the "containers" mapping of
+    execution_config.json, following aliases (e.g. web_server -> web_container
+    -> nginx-container), or by naming a configured container exactly. Anything
+    else raises ContainerNotFound rather than guessing. Handles are fetched once from the shared Docker client and reused; a
+    "not found" error drops the cached handle and the lookup is retried once.
+    """
+
+    def __init__(self, client, mapping=None, not_found_errors=()):
+        self.client = client
+        self.not_found_errors = tuple(not_found_errors)
+        self.lock = threading.Lock()
+        self.handles = {}
+        self.lookups = 0
+        self.cache_hits = 0
+        self.update_mapping(mapping or {})
+
+    def update_mapping(self, mapping):
+        """Install a new logical name mapping (e.g. after a config reload)"""
+        with self.lock:
+            self.mapping = dict(mapping)
+            # Values that are not aliases themselves are the real container names
+            self.container_names = set(self.mapping.values()) - set(self.mapping)
+            self.resolved = {}
+            self.handles = {}
+
+    def resolve_name(self, service_name):
+        """Map a service or logical name to the actual container name"""
+        resolved = self.resolved.get(service_name)
+        if resolved is not None:
+            return resolved
+
+        name, seen = service_name, set()
+        while name in self.mapping and name not in seen:
+            seen.add(name)
+            name = self.mapping[name]
+        if name not in self.container_names:
+            raise ContainerNotFound(f"No container configured for '{service_name}'")
+
+        self.resolved[service_name] = name
+        return name
+
+    def is_not_found(self, error):
+        return isinstance(error, self.not_found_errors) or type(error).__name__ == "NotFound"
+
+    def get(self, service_name):
+        """Return a cached container handle, fetching it from the daemon on a miss"""
+        container_name = self.resolve_name(service_name)
+        with self.lock:
+            self.lookups += 1
+            handle = self.handles.get(container_name)
+            if handle is not None:
+                self.cache_hits += 1
+                return handle
+
+        handle = self.client.containers.get(container_name)
+        with self.lock:
+            self.handles[container_name] = handle
+        return handle
+
+    def invalidate(self, service_name=None):
+        """Drop one cached handle (or all of them)"""
+        with self.lock:
+            if service_name is None:
+                self.handles.clear()
+            else:
+                self.handles.pop(self.resolve_name(service_name), None)
+
+    def call(self, service_name, operation):
+        """Run operation(container); on "not found" refresh the handle and retry once"""
+        container = self.get(service_name)
+        try:
+            return container, operation(container)
+        except Exception as e:
+            if not self.is_not_found(e):
+                raise
+            self.invalidate(service_name)
+            container = self.get(service_name)
+            return container, operation(container)
+
+    def stats(self):
+        return {
+            "lookups": self.lookups,
+            "cache_hits": self.cache_hits,
+            "cached_handles": len(self.handles)
+        }
@@ -0,0 +1,213 @@
+import csv
+import glob
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HUMAN_FEEDBACK_FILE = "data/human_feedback.csv"
+FEEDBACK_INBOX = "data/feedback_inbox"
+VALID_FEEDBACK = (1, -1)
+
+
+class FeedbackChannel:
+    """Asynchronous human feedback queue applied to a SmartAgent in batches.
+
+    Feedback can be submitted from any thread (CLI reader, file drop watcher,
+    HTTP endpoint); a background worker drains the queue, appends the batch to
+    the feedback CSV and persists the Q-table once per batch.
+    """
+
+    def __init__(self, agent, feedback_file=HUMAN_FEEDBACK_FILE, batch_size=50,
+                 flush_interval=2.0, lock=None):
+        self.agent = agent
+        self.feedback_file = feedback_file
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lock = lock or threading.Lock()
+
+        self.queue = queue.Queue()
+        self.last_decision = None
+        self.applied_count = 0
+        self._stop_event = threading.Event()
+        self._worker = None
+        self._http_server = None
+
+    def record_decision(self, state, action):
+        """Remember the latest decision so bare '1'/'-1' feedback can refer to it"""
+        self.last_decision = (state, action)
+
+    def submit(self, state, action, feedback, source="api"):
+        """Queue a feedback item; returns False if it is invalid.
+
+        Only actions the agent defines for the state are accepted, so
+        external sources cannot add new Q-table entries.
+        """
+        try:
+            feedback = int(feedback)
+        except (TypeError, ValueError):
+            return False
+        if feedback not in VALID_FEEDBACK or not state or not action:
+            return False
+        if action not in self.agent.get_actions(state):
+            return False
+
+        self.queue.put((state, action, feedback, source))
+        return True
+
+    def drain(self, batch=None, max_items=None):
+        """Pull queued items (without blocking) until the batch is full"""
+        batch = batch or []
+        limit = max_items or self.batch_size
+        while len(batch) < limit:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def apply_pending(self, max_items=None):
+        """Apply queued feedback as one batch; returns the number applied"""
+        return self.apply_batch(self.drain(max_items=max_items))
+
+    def apply_batch(self, batch):
+        """Log and apply a batch, persisting the Q-table once"""
+        if not batch:
+            return 0
+
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            with open(self.feedback_file, "a", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerows([timestamp, state, action, feedback] for state, action, feedback, _ in batch)
+        except Exception as e:
+            print(f"Feedback logging error: {e}")
+
+        with self.lock:
+            for state, action, feedback, _ in batch:
+                self.agent.human_update(state, action, feedback, persist=False)
+            self.agent.save_q_table()
+
+        self.applied_count += len(batch)
+        print(f"🧠 Human feedback applied: {len(batch)} item(s)")
+        return len(batch)
+
+    def start(self):
+        """Start the background worker that applies feedback batches"""
+        if self._worker and self._worker.is_alive():
+            return self._worker
+
+        def worker():
+            while not self._stop_event.is_set():
+                try:
+                    item = self.queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                try:
+                    self.apply_batch(self.drain([item]))
+                except Exception as e:
+                    print(f"❌ Feedback apply error: {e}")
+
+        self._worker = threading.Thread(target=worker, daemon=True)
+        self._worker.start()
+        return self._worker
+
+    def stop(self, timeout=10.0):
+        """Stop the HTTP source and worker, then flush what is left.
+
+        The worker finishes the batch it holds before exiting; it is joined
+        (up to timeout seconds) so nothing is applied after stop() returns.
+        """
+        self._stop_event.set()
+        if self._http_server:
+            self._http_server.shutdown()
+            self._http_server = None
+        if self._worker is not None:
+            self._worker.join(self.flush_interval + timeout)
+            if self._worker.is_alive():
+                print(f"⚠️ Feedback worker still busy after {timeout}s - flushing alongside it")
+            self._worker = None
+        while self.apply_pending():
+            pass
+
+    def start_cli_source(self, stream=None):
+        """Read feedback lines from stdin: '1' / '-1' or 'state action feedback'"""
+        stream = stream or sys.stdin
+
+        def reader():
+            for line in stream:
+                parts = line.strip().split()
+                if len(parts) == 1 and self.last_decision:
+                    state, action = self.last_decision
+                    ok = self.submit(state, action, parts[0], source="cli")
+                elif len(parts) == 3:
+                    ok = self.submit(parts[0], parts[1], parts[2], source="cli")
+                else:
+                    ok = False
+                if not ok and parts:
+                    print("➖ Feedback skipped (use 1, -1 or 'state action feedback')")
+
+        thread = threading.Thread(target=reader, daemon=True)
+        thread.start()
+        return thread
+
+    def start_file_drop_source(self, inbox_dir=FEEDBACK_INBOX, poll_interval=2.0):
+        """Watch a directory for CSV files with state,action,feedback columns"""
+        os.makedirs(inbox_dir, exist_ok=True)
+
+        def watcher():
+            while not self._stop_event.is_set():
+                for path in sorted(glob.glob(os.path.join(inbox_dir, "*.csv"))):
+                    try:
+                        with open(path, "r", newline="") as f:
+                            for row in csv.DictReader(f):
+                                self.submit(row.get("state"), row.get("action"), row.get("feedback"), source="file")
+                        os.replace(path, path + ".processed")
+                    except Exception as e:
+                        print(f"❌ Feedback file error ({path}): {e}")
+                time.sleep(poll_interval)
+
+        thread = threading.Thread(target=watcher, daemon=True)
+        thread.start()
+        return thread
+
+    def start_http_source(self, host="127.0.0.1", port=8765):
+        """Accept POST /feedback with a JSON object or list of {state, action, feedback}"""
+        channel = self
+
+        class FeedbackHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if self.path.rstrip("/") != "/feedback":
+                    self.send_error(404)
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except (ValueError, json.JSONDecodeError):
+                    self.send_error(400, "Invalid JSON")
+                    return
+
+                items = payload if isinstance(payload, list) else [payload]
+                accepted = sum(
+                    channel.submit(i.get("state"), i.get("action"), i.get("feedback"), source="http")
+                    for i in items if isinstance(i, dict)
+                )
+
+                body = json.dumps({"accepted": accepted, "rejected": len(items) - accepted}).encode()
+                self.send_response(202 if accepted else 400)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._http_server = ThreadingHTTPServer((host, port), FeedbackHandler)
+        thread = threading.Thread(target=self._http_server.serve_forever, daemon=True)
+        thread.start()
+        print(f"🌐 Feedback endpoint: http://{host}:{port}/feedback")
+        return thread
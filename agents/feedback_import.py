@@ -0,0 +1,141 @@
+import argparse
+import csv
+import os
+import time
+import numpy as np
+
+from .feedback_channel import VALID_FEEDBACK
+from .smart_agent import SmartAgent
+
+
+def apply_feedback_chunk(agent, states, actions, feedback):
+    """Apply one chunk of feedback rows with the human_update rule in closed form.
+
+    For a (state, action) group receiving feedback f_1..f_k in file order,
+    k sequential updates q <- q + alpha * (f - q) are equivalent to
+    q_k = d^k * q_0 + alpha * sum_i d^(k-i) * f_i  with  d = 1 - alpha.
+    """
+    pair_ids = {}
+    codes = np.fromiter(
+        (pair_ids.setdefault(pair, len(pair_ids)) for pair in zip(states, actions)),
+        dtype=np.int64, count=len(states)
+    )
+    feedback = np.asarray(feedback, dtype=float)
+    num_groups = len(pair_ids)
+
+    # Stable sort keeps file order inside each group
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    counts = np.bincount(sorted_codes, minlength=num_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    position = np.arange(len(sorted_codes)) - starts[sorted_codes]
+
+    decay = 1.0 - agent.alpha
+    exponents = counts[sorted_codes] - 1 - position
+    contributions = agent.alpha * np.power(decay, exponents) * feedback[order]
+    feedback_term = np.bincount(sorted_codes, weights=contributions, minlength=num_groups)
+    carry = np.power(decay, counts)
+
+    for (state, action), group in pair_ids.items():
+        current_q = agent.q_table[state][action]
+        agent.q_table[state][action] = carry[group] * current_q + feedback_term[group]
+
+    return {state for state, _ in pair_ids}
+
+
+def filter_feedback_chunk(agent, states, actions, feedback, valid_pairs):
+    """Drop rows FeedbackChannel.submit would reject; returns the kept columns and the rejected count.
+
+    valid_pairs caches the per-(state, action) check across chunks.
+    """
+    kept_states, kept_actions, kept_feedback = [], [], []
+    for state, action, value in zip(states, actions, feedback):
+        valid = valid_pairs.get((state, action))
+        if valid is None:
+            valid = valid_pairs[(state, action)] = action in agent.get_actions(state)
+        if valid and value in VALID_FEEDBACK:
+            kept_states.append(state)
+            kept_actions.append(action)
+            kept_feedback.append(value)
+    return kept_states, kept_actions, kept_feedback, len(states) - len(kept_states)
+
+
+def import_feedback(agent, feedback_path, chunk_size=100_000, persist=True):
+    """Re-apply an exported human feedback CSV (state, action, feedback) in one pass.
+
+    Rows are validated like FeedbackChannel.submit: unknown state/action pairs
+    and feedback other than 1 / -1 are counted as rejected and not applied.
+    """
+    start_time = time.time()
+    applied = skipped = rejected = 0
+    touched_states = set()
+    valid_pairs = {}
+
+    def apply_chunk(states, actions, values):
+        nonlocal applied, rejected
+        states, actions, values, dropped = filter_feedback_chunk(agent, states, actions, values, valid_pairs)
+        rejected += dropped
+        if states:
+            touched_states.update(apply_feedback_chunk(agent, states, actions, values))
+            applied += len(states)
+
+    with open(feedback_path, "r", newline="") as f:
+        reader = csv.DictReader(f)
+        states, actions, values = [], [], []
+
+        for row in reader:
+            try:
+                value = float(row["feedback"])
+                state, action = row["state"], row["action"]
+            except (KeyError, TypeError, ValueError):
+                skipped += 1
+                continue
+            if not state or not action:
+                skipped += 1
+                continue
+
+            states.append(state)
+            actions.append(action)
+            values.append(value)
+
+            if len(states) >= chunk_size:
+                apply_chunk(states, actions, values)
+                states, actions, values = [], [], []
+
+        if states:
+            apply_chunk(states, actions, values)
+
+    for state in touched_states:
+        agent.refresh_greedy_action(state)
+
+    if persist and applied:
+        agent.save_q_table()
+
+    return {
+        "applied": applied,
+        "skipped": skipped,
+        "rejected": rejected,
+        "states": len(touched_states),
+        "elapsed": time.time() - start_time
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import human feedback into the Q-table")
+    parser.add_argument("feedback_csv", nargs="+", help="CSV files with state, action, feedback columns")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--dry-run", action="store_true", help="apply in memory only")
+    args = parser.parse_args()
+
+    agent = SmartAgent()
+    for path in args.feedback_csv:
+        if not os.path.exists(path):
+            print(f"❌ Feedback file not found: {path}")
+            continue
+        stats = import_feedback(agent, path, chunk_size=args.chunk_size, persist=False)
+        print(f"🧠 {path}: applied {stats['applied']:,} rows across {stats['states']} states "
+              f"({stats['skipped']} skipped, {stats['rejected']} rejected) in {stats['elapsed']:.2f}s")
+
+    if not args.dry_run:
+        agent.save_q_table()
+        print("✅ RL Table Updated")
@@ -1,7 +1,9 @@
 import time
 import os
 import csv
+import threading
 from .smart_agent import SmartAgent
+from .feedback_channel import FeedbackChannel
 def execute_fix(action):
     """Simple auto-fix function that simulates fixing actions"""
     fix_actions = {
@@ -17,10 +19,15 @@ PLANNER_LOG = "logs/planner_log.csv"
 HUMAN_FEEDBACK_FILE = "data/human_feedback.csv"
 
 class PlannerAgent:
-    def __init__(self):
-        self.agent = SmartAgent()
+    def __init__(self, feedback_channel=None, exploit_only=False):
+        self.agent = SmartAgent(exploit_only=exploit_only)
+        self.lock = threading.Lock()
         self.ensure_files()
 
+        # Human feedback arrives asynchronously and is applied in batches
+        self.feedback = feedback_channel or FeedbackChannel(self.agent, HUMAN_FEEDBACK_FILE, lock=self.lock)
+        self.feedback.start()
+
     def ensure_files(self):
         # create logs folder
         if not os.path.exists("logs"):
@@ -44,18 +51,15 @@ class PlannerAgent:
             writer.writerow([time.strftime("%Y-%m-%d %H:%M:%S"), state, action, result, reward])
 
     def store_human_feedback(self, state, action, feedback):
-        with open(HUMAN_FEEDBACK_FILE, "a", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow([time.strftime("%Y-%m-%d %H:%M:%S"), state, action, feedback])
-
-        # update RL table from human learning
-        self.agent.human_update(state, action, feedback)
+        # queued; logged and applied to the RL table by the feedback worker
+        return self.feedback.submit(state, action, feedback)
 
     def handle_event(self, error_type):
         print(f"\n🚨 Error detected: {error_type}")
 
         # Ask RL agent for best action
-        action = self.agent.choose_action(error_type)
+        with self.lock:
+            action = self.agent.choose_action(error_type)
         print(f"🤖 RL chosen action: {action}")
 
         # Auto fix run
@@ -64,21 +68,16 @@ class PlannerAgent:
 
         # RL reward
         reward = 1 if result else -1
-        self.agent.update(error_type, action, reward)
+        with self.lock:
+            self.agent.update(error_type, action, reward)
 
         # Log
         self.log_fix(error_type, action, result, reward)
         print(f"🏆 Reward: {reward} | ✅ RL Table Updated")
 
-        # HUMAN FEEDBACK PROMPT ✅
-        fb = input("Give feedback (1 = correct, -1 = wrong, skip = ignore): ")
-
-        if fb.strip() in ["1", "-1"]:
-            fb = int(fb)
-            self.store_human_feedback(error_type, action, fb)
-            print(f"🧠 Human feedback applied: {fb}")
-        else:
-            print("➖ Feedback skipped")
+        # Human feedback is collected asynchronously - never block here
+        self.feedback.record_decision(error_type, action)
+        print("💬 Feedback (1 = correct, -1 = wrong) is accepted via the feedback channel")
 
         return result
 
@@ -87,3 +86,9 @@ class PlannerAgent:
 if __name__ == "__main__":
     planner = PlannerAgent()
     planner.handle_event("port_busy")
+
+    state, action = planner.feedback.last_decision
+    fb = input("Give feedback (1 = correct, -1 = wrong, skip = ignore): ")
+    if not planner.store_human_feedback(state, action, fb.strip()):
+        print("➖ Feedback skipped")
+    planner.feedback.stop()
@@ -0,0 +1,164 @@
+import argparse
+import csv
+import os
+import shutil
+import time
+
+MERGED_SNAPSHOT_NAME = "enhanced_rl_table.merged.csv"
+Q_TABLE_FIELDS = ["state", "action", "q_value", "visit_count", "last_updated"]
+# Extra column in merged snapshots: when the merge started reading the node tables
+MERGED_AT_FIELD = "merged_at"
+
+
+def iter_q_table(path):
+    """Stream (state, action, q_value, visit_count, last_updated) rows from a Q-table CSV"""
+    with open(path, "r", newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                yield (
+                    row["state"],
+                    row["action"],
+                    float(row["q_value"]),
+                    int(float(row.get("visit_count") or 0)),
+                    float(row.get("last_updated") or 0)
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+
+
+def load_q_table_rows(path):
+    """Load a Q-table CSV into {(state, action): (q_value, visit_count, last_updated)}"""
+    if not path or not os.path.exists(path):
+        return {}
+    return {(state, action): (q, visits, updated) for state, action, q, visits, updated in iter_q_table(path)}
+
+
+def load_merged_snapshot(path):
+    """Load a merged snapshot as (rows, merged_at); merged_at is None for snapshots written without it"""
+    merged_at = None
+    with open(path, "r", newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                merged_at = float(row[MERGED_AT_FIELD])
+            except (KeyError, TypeError, ValueError):
+                pass
+            break
+    return load_q_table_rows(path), merged_at
+
+
+def merge_q_tables(paths, base=None):
+    """Merge Q-tables from several nodes, weighting each q_value by its visit_count.
+
+    When base (the previous merged snapshot, as returned by load_q_table_rows)
+    is given, node visit counts are treated as increments over the base so
+    repeated merge/push cycles do not count shared history more than once.
+    Rows are streamed; memory grows with distinct (state, action) pairs only.
+    """
+    base = base or {}
+    # key -> [weighted q sum, weight sum, plain q sum, node count, last_updated]
+    totals = {}
+
+    for path in paths:
+        for state, action, q_value, visits, updated in iter_q_table(path):
+            key = (state, action)
+            base_visits = base[key][1] if key in base else 0
+            weight = max(visits - base_visits, 0)
+
+            entry = totals.get(key)
+            if entry is None:
+                entry = totals[key] = [0.0, 0, 0.0, 0, 0.0]
+            entry[0] += q_value * weight
+            entry[1] += weight
+            entry[2] += q_value
+            entry[3] += 1
+            entry[4] = max(entry[4], updated)
+
+    merged = dict(base)
+    for key, (weighted_q, weight, q_sum, count, updated) in totals.items():
+        base_q, base_visits, base_updated = base.get(key, (None, 0, 0.0))
+        if weight > 0:
+            q_value = weighted_q / weight
+        elif base_q is not None:
+            q_value = base_q
+        else:
+            q_value = q_sum / count
+        merged[key] = (q_value, base_visits + weight, max(updated, base_updated))
+    return merged
+
+
+def write_q_table(merged, path, merged_at=None):
+    """Atomically write a merged table in the enhanced_rl_table.csv format.
+
+    With merged_at, every row also carries it in a merged_at column so the
+    timestamp travels with the snapshot however it is copied.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    extra = [] if merged_at is None else [merged_at]
+    with open(tmp_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(Q_TABLE_FIELDS + ([MERGED_AT_FIELD] if extra else []))
+        for (state, action), (q_value, visits, updated) in sorted(merged.items()):
+            writer.writerow([state, action, q_value, visits, updated] + extra)
+    os.replace(tmp_path, path)
+
+
+def push_snapshot(snapshot_path, node_paths):
+    """Copy the merged snapshot next to each node's table for the node to pick up"""
+    pushed = []
+    for node_path in node_paths:
+        target = os.path.join(os.path.dirname(os.path.abspath(node_path)), MERGED_SNAPSHOT_NAME)
+        try:
+            tmp_path = target + ".tmp"
+            shutil.copyfile(snapshot_path, tmp_path)
+            os.replace(tmp_path, target)
+            pushed.append(target)
+        except Exception as e:
+            print(f"❌ Push failed for {target}: {e}")
+    return pushed
+
+
+def run_merge(node_paths, output_path, base_path=None, push=False):
+    """Merge node tables into output_path (using base_path as the previous snapshot)"""
+    existing = [p for p in node_paths if os.path.exists(p)]
+    missing = set(node_paths) - set(existing)
+    for path in missing:
+        print(f"⚠️ Q-table not found, skipping: {path}")
+
+    start_time = time.time()
+    merged = merge_q_tables(existing, base=load_q_table_rows(base_path))
+    write_q_table(merged, output_path, merged_at=start_time)
+    print(f"🔀 Merged {len(existing)} tables → {len(merged)} state-action pairs "
+          f"in {time.time() - start_time:.2f}s ({output_path})")
+
+    if push:
+        pushed = push_snapshot(output_path, existing)
+        print(f"📤 Snapshot pushed to {len(pushed)} node(s)")
+    return merged
+
+
+def run_periodic_merge(node_paths, output_path, interval=300, push=True):
+    """Merge on a fixed interval; each run uses the previous snapshot as its base"""
+    print(f"⏲️ Periodic Q-table merge every {interval}s")
+    while True:
+        try:
+            base_path = output_path if os.path.exists(output_path) else None
+            run_merge(node_paths, output_path, base_path=base_path, push=push)
+        except Exception as e:
+            print(f"❌ Merge error: {e}")
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Visit-count-weighted merge of node Q-tables")
+    parser.add_argument("tables", nargs="+", help="enhanced_rl_table.csv from each node (local or mounted paths)")
+    parser.add_argument("-o", "--output", default=os.path.join("data", "enhanced_rl_table.merged_all.csv"))
+    parser.add_argument("--base", default=None, help="previous merged snapshot (visit counts become increments)")
+    parser.add_argument("--push", action="store_true", help=f"write {MERGED_SNAPSHOT_NAME} next to each node table")
+    parser.add_argument("--interval", type=int, default=0, help="run periodically every N seconds")
+    args = parser.parse_args()
+
+    if args.interval > 0:
+        run_periodic_merge(args.tables, args.output, interval=args.interval, push=args.push)
+    else:
+        run_merge(args.tables, args.output, base_path=args.base, push=args.push)
@@ -0,0 +1,134 @@
+import csv
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+
+class QTableShard:
+    """Q-values and visit counts for a single service, backed by its own CSV"""
+
+    def __init__(self, service, path):
+        self.service = service
+        self.path = path
+        self.q_table = defaultdict(lambda: defaultdict(float))
+        self.state_visit_count = defaultdict(int)
+        self.dirty = False
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return self
+
+        try:
+            with open(self.path, "r") as f:
+                for row in csv.DictReader(f):
+                    state = row["state"]
+                    action = row["action"]
+                    self.q_table[state][action] = float(row["q_value"])
+                    self.state_visit_count[f"{state}_{action}"] = int(row.get("visit_count", 0))
+        except Exception as e:
+            print(f"Error loading Q-table shard {self.service}: {e}")
+        return self
+
+    def save(self):
+        try:
+            rows = []
+            for state, actions in self.q_table.items():
+                for action, q_value in actions.items():
+                    visit_count = self.state_visit_count.get(f"{state}_{action}", 0)
+                    rows.append([state, action, q_value, visit_count, time.time()])
+
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["state", "action", "q_value", "visit_count", "last_updated"])
+                writer.writerows(rows)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except Exception as e:
+            print(f"Error saving Q-table shard {self.service}: {e}")
+
+
+class QTableShardStore:
+    """Per-service Q-table shards, loaded lazily and evicted least-recently-used.
+
+    Only max_loaded shards are kept in memory; evicted shards are written back
+    if they have unsaved changes. Shard files are named <sanitized>-<hash>.csv
+    so distinct services never share a file, and index.json maps each file
+    stem back to the original service name.
+    """
+
+    def __init__(self, shard_dir, max_loaded=64):
+        self.shard_dir = shard_dir
+        self.max_loaded = max_loaded
+        self.shards = OrderedDict()
+        self.lock = threading.RLock()
+        os.makedirs(shard_dir, exist_ok=True)
+        self.index_path = os.path.join(shard_dir, "index.json")
+        self.index = self.load_index()
+
+    def load_index(self):
+        try:
+            with open(self.index_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def shard_stem(self, service):
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", str(service)) or "unknown"
+        digest = hashlib.sha1(str(service).encode()).hexdigest()[:8]
+        return f"{safe_name}-{digest}"
+
+    def shard_path(self, service):
+        return os.path.join(self.shard_dir, f"{self.shard_stem(service)}.csv")
+
+    def get(self, service):
+        """Return the shard for a service, loading it on first use"""
+        with self.lock:
+            shard = self.shards.get(service)
+            if shard is not None:
+                self.shards.move_to_end(service)
+                return shard
+
+            stem = self.shard_stem(service)
+            if self.index.get(stem) != service:
+                self.index[stem] = service
+                self.save_index()
+
+            shard = QTableShard(service, self.shard_path(service)).load()
+            self.shards[service] = shard
+            while len(self.shards) > self.max_loaded:
+                _, cold = self.shards.popitem(last=False)
+                if cold.dirty:
+                    cold.save()
+            return shard
+
+    def save(self, service):
+        with self.lock:
+            shard = self.shards.get(service)
+            if shard is not None:
+                shard.save()
+
+    def flush(self):
+        """Write back every loaded shard with unsaved changes"""
+        with self.lock:
+            for shard in self.shards.values():
+                if shard.dirty:
+                    shard.save()
+
+    def services(self):
+        """Services (original names) with a shard on disk or in memory"""
+        on_disk = {
+            self.index.get(name[:-4], name[:-4])
+            for name in os.listdir(self.shard_dir) if name.endswith(".csv")
+        }
+        return sorted(on_disk | set(self.shards))
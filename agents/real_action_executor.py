@@ -1,9 +1,21 @@
 import subprocess
 import time
 import os
+import sys
 import json
+import shlex
+import signal
+import threading
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import Future
+from string import Template
 from datetime import datetime
 
+from .container_readiness import ReadinessWaiter, make_probe, DEFAULT_READINESS
+from .container_registry import ContainerRegistry
+from .remediation_plan import RemediationPlan, PlanRunner, check_plan_recursion
+from core.process_table import ProcessTable
+
 # Optional imports
 try:
     import requests
@@ -19,14 +31,225 @@ except ImportError:
     docker = None
     DOCKER_AVAILABLE = False
 
-class RealActionExecutor:
+# Fallback command templates for services without explicit commands
+DEFAULT_COMMAND_TEMPLATES = {
+    "restart_command": "systemctl restart ${service}",
+    "status_command": "systemctl status ${service}"
+}
+
+# Command timeouts and output capture limits
+DEFAULT_EXECUTION_LIMITS = {
+    "default_timeout": 60,
+    "kill_grace_period": 2,
+    "max_output_kb": 64,
+    "plan_workers": 4,
+    "result_cooldown": 60,
+    "result_cache_size": 256,
+    "timeouts": {
+        "restart_service_graceful": 30,
+        "restart_service_force": 30,
+        "scale_horizontal": 120,
+        "rollback_deployment": 180,
+        "reset_connection_pool": 10
+    }
+}
+
+# Multi-step remediations: steps run as soon as their dependencies succeed
+DEFAULT_REMEDIATION_PLANS = {
+    "rollback_deployment": [
+        {"name": "record_history", "command": "git log --oneline -n 5"},
+        {"name": "reset_code", "command": "git reset --hard HEAD~1", "depends_on": ["record_history"]},
+        {"name": "redeploy", "command": "docker-compose up -d ${service}", "depends_on": ["reset_code"]}
+    ],
+    "recover_database_connection": [
+        {"name": "reset_pool", "action": "reset_connection_pool"},
+        {"name": "scale_out", "action": "scale_horizontal"},
+        {"name": "restart_application", "action": "restart_service_graceful", "depends_on": ["reset_pool", "scale_out"]}
+    ]
+}
+
+CommandOutcome = namedtuple("CommandOutcome", ["returncode", "stdout", "stderr", "timed_out", "truncated"])
+
+class BoundedOutputBuffer:
+    """Ring buffer that keeps only the last max_bytes of a stream"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.chunks = deque()
+        self.size = 0
+        self.dropped_bytes = 0
+
+    def write(self, chunk):
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+        while self.size > self.max_bytes and self.chunks:
+            excess = self.size - self.max_bytes
+            head = self.chunks[0]
+            if len(head) <= excess:
+                self.chunks.popleft()
+                self.size -= len(head)
+                self.dropped_bytes += len(head)
+            else:
+                self.chunks[0] = head[excess:]
+                self.size -= excess
+                self.dropped_bytes += excess
+
+    @property
+    def truncated(self):
+        return self.dropped_bytes > 0
+
+    def getvalue(self):
+        text = b"".join(self.chunks).decode(errors="replace")
+        if self.truncated:
+            return f"[... {self.dropped_bytes} bytes truncated ...]\n{text}"
+        return text
+
+class CommandTemplate:
+    """Precompiled command: the raw string plus its shell-free argv form"""
+
+    def __init__(self, command):
+        self.command = command
+        self.template = Template(command)
+        self.is_static = not self.template.pattern.search(command)
+        self._argv = tuple(shlex.split(command)) if self.is_static else None
+
+    def render(self, **values):
+        if self.is_static:
+            return self.command
+        return self.template.safe_substitute(**values)
+
+    def argv(self, **values):
+        if self._argv is not None:
+            return list(self._argv)
+        return shlex.split(self.render(**values))
+
+class InFlightRegistry:
+    """Coalesces concurrent identical requests onto a single running execution.
+
+    The first caller for a key runs the work; callers arriving while it is in
+    flight wait for and share its result instead of starting another run.
+    """
+
     def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.coalesced_count = 0
+
+    def run(self, key, fn):
+        with self.lock:
+            future = self.in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self.in_flight[key] = future
+            else:
+                self.coalesced_count += 1
+
+        if not is_leader:
+            result = dict(future.result())
+            result["coalesced"] = True
+            return result
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.in_flight.pop(key, None)
+
+class RecentResultCache:
+    """TTL cache of successful remediation results keyed by (action, service, incident).
+
+    While an entry is younger than the cooldown, repeating the same remediation
+    for the same incident returns the stored result instead of re-executing.
+    Failed results are never cached so a failed remediation can be retried.
+    """
+
+    def __init__(self, cooldown=60, max_entries=256, clock=time.monotonic):
+        self.cooldown = cooldown
+        self.max_entries = max_entries
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, cooldown, max_entries):
+        with self.lock:
+            self.cooldown = cooldown
+            self.max_entries = max_entries
+            while len(self.entries) > max_entries:
+                self.entries.popitem(last=False)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                stored_at, result = entry
+                age = self.clock() - stored_at
+                if age < self.cooldown:
+                    self.hits += 1
+                    cached = dict(result)
+                    cached["cached"] = True
+                    cached["cache_age"] = age
+                    return cached
+                del self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, result):
+        if not result.get("success") or self.cooldown <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (self.clock(), result)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, service_name=None):
+        """Forget cached results (all, or just one service's)"""
+        with self.lock:
+            if service_name is None:
+                self.entries.clear()
+            else:
+                for key in [k for k in self.entries if k[1] == service_name]:
+                    del self.entries[key]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "cached_results": len(self.entries)
+        }
+
+class RealActionExecutor:
+    def __init__(self, docker_client=None):
         self.project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.execution_log = os.path.join(self.project_root, "logs", "action_execution.log")
+        # Recent successes are replayed instead of re-executed within the cooldown
+        self.result_cache = RecentResultCache()
         self.load_execution_config()
+        self.load_readiness_probes()
+        
+        # Identical (service, action) requests share one in-flight execution
+        self.in_flight = InFlightRegistry()
         
-        # Initialize Docker client if available
-        if DOCKER_AVAILABLE:
+        # Signal processes straight from /proc instead of forking pkill (Linux only)
+        self.process_table = ProcessTable()
+        if os.name == 'nt' or not self.process_table.available:
+            self.process_table = None
+        
+        # Initialize Docker client if available (an injected client is used as-is)
+        if docker_client is not None:
+            self.docker_client = docker_client
+            self.docker_available = True
+        elif DOCKER_AVAILABLE:
             try:
                 self.docker_client = docker.from_env()
                 self.docker_available = True
@@ -38,6 +261,12 @@ class RealActionExecutor:
             self.docker_client = None
             self.docker_available = False
             print("⚠️ Docker module not installed - container actions will be simulated")
+        
+        # Logical name -> container handle cache on the shared client
+        self.containers = None
+        if self.docker_available:
+            not_found = (docker.errors.NotFound,) if DOCKER_AVAILABLE else ()
+            self.containers = ContainerRegistry(self.docker_client, self.config.get("containers", {}), not_found)
 
     def load_execution_config(self):
         """Load real execution configurations"""
@@ -65,6 +294,9 @@ class RealActionExecutor:
                 }
             },
             "containers": {
+                "web_server": "web_container",
+                "database": "db_container",
+                "api_service": "api_container",
                 "web_container": "nginx-container",
                 "api_container": "api-service-container", 
                 "db_container": "postgres-container"
@@ -72,7 +304,10 @@ class RealActionExecutor:
             "network": {
                 "interface": "eth0",
                 "dns_servers": ["8.8.8.8", "1.1.1.1"]
-            }
+            },
+            "execution": DEFAULT_EXECUTION_LIMITS,
+            "readiness": DEFAULT_READINESS,
+            "remediation_plans": DEFAULT_REMEDIATION_PLANS
         }
         
         try:
@@ -87,6 +322,204 @@ class RealActionExecutor:
             print(f"Config error: {e}")
             self.config = default_config
 
+        self.config_path = config_path
+        try:
+            compiled = self.compile_execution_config(self.config)
+        except ValueError as e:
+            print(f"Config error: {e}, using defaults")
+            compiled = self.compile_execution_config(default_config)
+        self.apply_execution_config(compiled)
+
+    def compile_execution_config(self, config):
+        """Validate the execution config and precompile its command templates"""
+        services = config.get("services", {})
+        if not isinstance(services, dict):
+            raise ValueError("'services' must be a mapping of service -> commands")
+
+        commands = {}
+        for service_name, service_config in services.items():
+            if not isinstance(service_config, dict):
+                raise ValueError(f"service '{service_name}' must be a mapping")
+            commands[sys.intern(service_name)] = {
+                key: CommandTemplate(value)
+                for key, value in service_config.items()
+                if key.endswith("_command") and isinstance(value, str)
+            }
+
+        containers = config.get("containers", {})
+        if not isinstance(containers, dict) or not all(isinstance(v, str) for v in containers.values()):
+            raise ValueError("'containers' must map logical names to container names")
+
+        limits = dict(DEFAULT_EXECUTION_LIMITS)
+        limits.update(config.get("execution", {}))
+        for key in ("default_timeout", "kill_grace_period", "max_output_kb", "plan_workers"):
+            if not isinstance(limits[key], (int, float)) or limits[key] <= 0:
+                raise ValueError(f"execution.{key} must be a positive number")
+        for key in ("result_cooldown", "result_cache_size"):
+            if not isinstance(limits[key], (int, float)) or limits[key] < 0:
+                raise ValueError(f"execution.{key} must be a non-negative number")
+
+        readiness = dict(DEFAULT_READINESS)
+        readiness.update(config.get("readiness", {}))
+        for key in ("deadline", "initial_delay", "max_delay", "backoff", "probe_timeout"):
+            if not isinstance(readiness[key], (int, float)) or readiness[key] <= 0:
+                raise ValueError(f"readiness.{key} must be a positive number")
+
+        plan_configs = config.get("remediation_plans", DEFAULT_REMEDIATION_PLANS)
+        if not isinstance(plan_configs, dict):
+            raise ValueError("'remediation_plans' must be a mapping of plan -> steps")
+        plans = {
+            name: RemediationPlan.from_config(name, steps, compile_command=CommandTemplate)
+            for name, steps in plan_configs.items()
+        }
+        check_plan_recursion(plans)
+
+        return {
+            "config": config,
+            "limits": limits,
+            "readiness": readiness,
+            "plans": plans,
+            "commands": commands,
+            "default_commands": {key: CommandTemplate(value) for key, value in DEFAULT_COMMAND_TEMPLATES.items()}
+        }
+
+    def apply_execution_config(self, compiled):
+        """Swap in a compiled execution config"""
+        self.config = compiled["config"]
+        self.compiled = compiled
+        limits = compiled["limits"]
+        self.result_cache.configure(limits["result_cooldown"], int(limits["result_cache_size"]))
+        if getattr(self, "containers", None) is not None:
+            self.containers.update_mapping(self.config.get("containers", {}))
+
+    def watch_config(self, watcher):
+        """Register execution_config.json with a ConfigWatcher for hot reload"""
+        watcher.watch(self.config_path, self.compile_execution_config, self.apply_execution_config,
+                      name="execution_config.json")
+
+    def get_command_template(self, service_name, command_key):
+        """Resolve a service command template, falling back to the default"""
+        compiled = self.compiled
+        template = compiled["commands"].get(service_name, {}).get(command_key)
+        if template is None:
+            template = compiled["default_commands"][command_key]
+        return template
+
+    def get_command(self, service_name, command_key):
+        """Resolve a service command as a shell string"""
+        return self.get_command_template(service_name, command_key).render(service=service_name)
+
+    def get_command_argv(self, service_name, command_key):
+        """Resolve a service command as an argv list (no shell)"""
+        return self.get_command_template(service_name, command_key).argv(service=service_name)
+
+    def load_readiness_probes(self):
+        """Index deployment_config.json services by name for readiness probes"""
+        deployment_config = os.path.join(self.project_root, "config", "deployment_config.json")
+        self.probe_targets = {}
+        try:
+            if os.path.exists(deployment_config):
+                with open(deployment_config, 'r') as f:
+                    services = json.load(f).get("services", [])
+                self.probe_targets = {s["name"]: s for s in services if "name" in s}
+        except Exception as e:
+            print(f"Readiness probe config error: {e}")
+
+    def readiness_waiter(self):
+        """Build a readiness waiter from the current config"""
+        readiness = self.compiled["readiness"]
+        return ReadinessWaiter(
+            deadline=readiness["deadline"],
+            initial_delay=readiness["initial_delay"],
+            max_delay=readiness["max_delay"],
+            backoff=readiness["backoff"]
+        )
+
+    def action_timeout(self, action):
+        """Configured timeout in seconds for an action's commands"""
+        limits = self.compiled["limits"]
+        return limits.get("timeouts", {}).get(action, limits["default_timeout"])
+
+    def run_command(self, command, action):
+        """Run a shell command with a hard timeout and bounded output capture.
+
+        The command runs in its own process group so a timeout kills everything
+        it spawned (SIGTERM, then SIGKILL after the grace period). Only the last
+        max_output_kb of stdout/stderr is kept.
+        """
+        limits = self.compiled["limits"]
+        timeout = self.action_timeout(action)
+        max_bytes = int(limits["max_output_kb"] * 1024)
+        stdout_buffer = BoundedOutputBuffer(max_bytes)
+        stderr_buffer = BoundedOutputBuffer(max_bytes)
+
+        process = subprocess.Popen(
+            command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            start_new_session=(os.name != 'nt')
+        )
+
+        def pump(stream, buffer):
+            for chunk in iter(lambda: stream.read1(4096), b""):
+                buffer.write(chunk)
+            stream.close()
+
+        readers = [
+            threading.Thread(target=pump, args=(process.stdout, stdout_buffer), daemon=True),
+            threading.Thread(target=pump, args=(process.stderr, stderr_buffer), daemon=True)
+        ]
+        for reader in readers:
+            reader.start()
+
+        timed_out = False
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            self.kill_process_group(process, limits["kill_grace_period"])
+
+        for reader in readers:
+            reader.join(timeout=1)
+
+        stderr = stderr_buffer.getvalue()
+        if timed_out:
+            stderr += f"\nCommand timed out after {timeout}s and was killed"
+
+        return CommandOutcome(
+            returncode=process.returncode,
+            stdout=stdout_buffer.getvalue(),
+            stderr=stderr,
+            timed_out=timed_out,
+            truncated=stdout_buffer.truncated or stderr_buffer.truncated
+        )
+
+    def kill_process_group(self, process, grace_period):
+        """Terminate a command's whole process group, escalating to SIGKILL"""
+        try:
+            if os.name != 'nt':
+                os.killpg(process.pid, signal.SIGTERM)
+            else:
+                process.terminate()
+            process.wait(timeout=grace_period)
+        except subprocess.TimeoutExpired:
+            try:
+                if os.name != 'nt':
+                    os.killpg(process.pid, signal.SIGKILL)
+                else:
+                    process.kill()
+            except ProcessLookupError:
+                pass
+            process.wait()
+        except ProcessLookupError:
+            process.wait()
+
+    def annotate_outcome(self, result, outcome):
+        """Record timeout/truncation details from a command outcome in a result"""
+        if outcome.timed_out:
+            result["timed_out"] = True
+        if outcome.truncated:
+            result["output_truncated"] = True
+        return result
+
     def log_execution(self, action, result, details):
         """Log real action execution results"""
         log_entry = {
@@ -103,22 +536,21 @@ class RealActionExecutor:
         except Exception as e:
             print(f"Logging error: {e}")
 
-    def execute_restart_service_graceful(self, service_name):
+    def execute_restart_service_graceful(self, service_name, action="restart_service_graceful"):
         """Gracefully restart a system service"""
         start_time = time.time()
         
         try:
-            service_config = self.config["services"].get(service_name, {})
-            restart_cmd = service_config.get("restart_command", f"systemctl restart {service_name}")
+            restart_cmd = self.get_command(service_name, "restart_command")
             
             print(f"🔄 Gracefully restarting {service_name}...")
             
             # Check service status first
-            status_cmd = service_config.get("status_command", f"systemctl status {service_name}")
-            status_result = subprocess.run(status_cmd, shell=True, capture_output=True, text=True)
+            status_cmd = self.get_command(service_name, "status_command")
+            status_result = self.run_command(status_cmd, action)
             
             # Perform graceful restart
-            restart_result = subprocess.run(restart_cmd, shell=True, capture_output=True, text=True)
+            restart_result = self.run_command(restart_cmd, action)
             
             execution_time = time.time() - start_time
             
@@ -136,8 +568,9 @@ class RealActionExecutor:
                     "message": f"Failed to restart {service_name}",
                     "error": restart_result.stderr
                 }
+            self.annotate_outcome(result, restart_result)
             
-            self.log_execution("restart_service_graceful", result["success"], result)
+            self.log_execution(action, result["success"], result)
             return result
             
         except Exception as e:
@@ -148,7 +581,7 @@ class RealActionExecutor:
                 "message": f"Exception during restart: {str(e)}",
                 "error": str(e)
             }
-            self.log_execution("restart_service_graceful", False, result)
+            self.log_execution(action, False, result)
             return result
 
     def execute_restart_container(self, container_name):
@@ -166,20 +599,23 @@ class RealActionExecutor:
         try:
             print(f"🐳 Restarting container {container_name}...")
             
-            container = self.docker_client.containers.get(container_name)
-            container.restart()
+            container, _ = self.containers.call(container_name, lambda c: c.restart())
             
-            # Wait for container to be healthy
-            time.sleep(2)
-            container.reload()
+            # Wait until the container (and its probe, if configured) is ready
+            probe = make_probe(self.probe_targets.get(container_name), self.compiled["readiness"]["probe_timeout"])
+            readiness = self.readiness_waiter().wait(container, probe)
             
             execution_time = time.time() - start_time
             
             result = {
-                "success": container.status == "running",
+                "success": readiness["ready"],
                 "execution_time": execution_time,
-                "message": f"Container {container_name} restarted",
-                "status": container.status
+                "message": f"Container {container_name} restarted" if readiness["ready"]
+                           else f"Container {container_name} not ready: {readiness['reason']}",
+                "container": container.name if hasattr(container, "name") else self.containers.resolve_name(container_name),
+                "status": readiness["status"],
+                "health": readiness["health"],
+                "readiness_checks": readiness["attempts"]
             }
             
             self.log_execution("restart_container", result["success"], result)
@@ -206,7 +642,7 @@ class RealActionExecutor:
             if self.docker_available:
                 # Docker Swarm scaling
                 scale_cmd = f"docker service scale {service_name}={target_instances}"
-                result = subprocess.run(scale_cmd, shell=True, capture_output=True, text=True)
+                result = self.run_command(scale_cmd, "scale_horizontal")
                 
                 execution_time = time.time() - start_time
                 
@@ -224,6 +660,7 @@ class RealActionExecutor:
                         "message": f"Failed to scale {service_name}",
                         "error": result.stderr
                     }
+                self.annotate_outcome(response, result)
             else:
                 # Simulate scaling
                 time.sleep(1)  # Simulate scaling time
@@ -249,43 +686,42 @@ class RealActionExecutor:
             self.log_execution("scale_horizontal", False, result)
             return result
 
-    def execute_rollback_deployment(self, service_name):
-        """Rollback to previous deployment version"""
+    def run_plan_step(self, plan_name, step, service_name, context):
+        """Run one plan step: a templated command or another executor action"""
+        if step.action is not None:
+            return self.execute_action(step.action, dict(context, service=service_name))
+
+        command = step.command.render(service=service_name)
+        outcome = self.run_command(command, plan_name)
+        return self.annotate_outcome({
+            "success": outcome.returncode == 0,
+            "command": command,
+            "returncode": outcome.returncode,
+            "stdout": outcome.stdout,
+            "stderr": outcome.stderr
+        }, outcome)
+
+    def execute_plan(self, plan_name, service_name, context=None):
+        """Run a remediation plan, executing independent steps concurrently"""
+        context = context or {}
         start_time = time.time()
         
         try:
-            print(f"⏪ Rolling back deployment for {service_name}...")
+            plan = self.compiled["plans"][plan_name]
+            print(f"🧩 Running remediation plan {plan_name} for {service_name}...")
             
-            # Git-based rollback
-            rollback_commands = [
-                "git log --oneline -n 5",  # Show recent commits
-                "git reset --hard HEAD~1",  # Rollback to previous commit
-                f"docker-compose up -d {service_name}"  # Redeploy
-            ]
-            
-            results = []
-            for cmd in rollback_commands:
-                result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-                results.append({
-                    "command": cmd,
-                    "returncode": result.returncode,
-                    "stdout": result.stdout,
-                    "stderr": result.stderr
-                })
-            
-            execution_time = time.time() - start_time
-            
-            # Check if all commands succeeded
-            success = all(r["returncode"] == 0 for r in results)
+            runner = PlanRunner(max_workers=int(self.compiled["limits"]["plan_workers"]))
+            outcome = runner.run(plan, lambda step: self.run_plan_step(plan_name, step, service_name, context))
             
             response = {
-                "success": success,
-                "execution_time": execution_time,
-                "message": f"Rollback {'completed' if success else 'failed'} for {service_name}",
-                "commands_executed": results
+                "success": outcome["success"],
+                "execution_time": time.time() - start_time,
+                "message": f"Plan {plan_name} {'completed' if outcome['success'] else 'failed'} for {service_name}",
+                "step_statuses": outcome["statuses"],
+                "steps": outcome["steps"]
             }
             
-            self.log_execution("rollback_deployment", success, response)
+            self.log_execution(plan_name, response["success"], response)
             return response
             
         except Exception as e:
@@ -293,12 +729,24 @@ class RealActionExecutor:
             result = {
                 "success": False,
                 "execution_time": execution_time,
-                "message": f"Rollback failed: {str(e)}",
+                "message": f"Plan {plan_name} failed: {str(e)}",
                 "error": str(e)
             }
-            self.log_execution("rollback_deployment", False, result)
+            self.log_execution(plan_name, False, result)
             return result
 
+    def execute_rollback_deployment(self, service_name):
+        """Rollback to previous deployment version"""
+        print(f"⏪ Rolling back deployment for {service_name}...")
+        
+        # Git-based rollback, defined as the rollback_deployment plan
+        response = self.execute_plan("rollback_deployment", service_name)
+        response["message"] = f"Rollback {'completed' if response['success'] else 'failed'} for {service_name}"
+        response["commands_executed"] = [
+            step for step in response.get("steps", {}).values() if "command" in step
+        ]
+        return response
+
     def execute_reset_connection_pool(self, service_name):
         """Reset database connection pool"""
         start_time = time.time()
@@ -307,8 +755,17 @@ class RealActionExecutor:
             print(f"🔄 Resetting connection pool for {service_name}...")
             
             # Send SIGHUP to reload configuration
-            reload_cmd = f"pkill -HUP -f {service_name}"
-            result = subprocess.run(reload_cmd, shell=True, capture_output=True, text=True)
+            if self.process_table is not None:
+                signalled = self.process_table.refresh().signal(service_name, signal.SIGHUP)
+                result = CommandOutcome(
+                    0 if signalled else 1,
+                    f"Sent SIGHUP to {len(signalled)} process(es): {signalled}" if signalled else "",
+                    "" if signalled else f"No processes matching '{service_name}'",
+                    False, False
+                )
+            else:
+                reload_cmd = f"pkill -HUP -f {service_name}"
+                result = self.run_command(reload_cmd, "reset_connection_pool")
             
             execution_time = time.time() - start_time
             
@@ -318,6 +775,7 @@ class RealActionExecutor:
                 "message": f"Connection pool reset for {service_name}",
                 "output": result.stdout if result.returncode == 0 else result.stderr
             }
+            self.annotate_outcome(response, result)
             
             self.log_execution("reset_connection_pool", response["success"], response)
             return response
@@ -333,6 +791,17 @@ class RealActionExecutor:
             self.log_execution("reset_connection_pool", False, result)
             return result
 
+    def incident_id(self, context):
+        """Idempotency key for the incident behind a request.
+
+        An explicit incident_id wins; otherwise repeated reports of the same
+        error type on a service are treated as the same incident.
+        """
+        if context.get('incident_id') is not None:
+            return context['incident_id']
+        issue_data = context.get('issue_data') or {}
+        return issue_data.get('incident_id') or issue_data.get('error_type')
+
     def execute_action(self, action, context=None):
         """Execute real deployment action based on action type"""
         context = context or {}
@@ -340,7 +809,7 @@ class RealActionExecutor:
         
         action_map = {
             "restart_service_graceful": lambda: self.execute_restart_service_graceful(service_name),
-            "restart_service_force": lambda: self.execute_restart_service_graceful(service_name),
+            "restart_service_force": lambda: self.execute_restart_service_graceful(service_name, "restart_service_force"),
             "restart_container": lambda: self.execute_restart_container(service_name),
             "scale_horizontal": lambda: self.execute_scale_horizontal(service_name),
             "rollback_deployment": lambda: self.execute_rollback_deployment(service_name),
@@ -348,7 +817,22 @@ class RealActionExecutor:
         }
         
         if action in action_map:
-            return action_map[action]()
+            run = action_map[action]
+        elif action in self.compiled["plans"]:
+            run = lambda: self.execute_plan(action, service_name, context)
+        else:
+            run = None
+
+        if run is not None:
+            cache_key = (action, service_name, self.incident_id(context))
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                print(f"♻️ Reusing {action} result for {service_name} ({cached['cache_age']:.0f}s old)")
+                return cached
+            result = self.in_flight.run((service_name, action), run)
+            if not result.get("coalesced"):
+                self.result_cache.put(cache_key, result)
+            return result
         else:
             # Default action for unknown actions
             return {
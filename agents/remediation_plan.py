@@ -0,0 +1,217 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+class RemediationStep:
+    """One step of a plan: a shell command or another executor action"""
+
+    def __init__(self, name, command=None, action=None, depends_on=()):
+        if (command is None) == (action is None):
+            raise ValueError(f"step '{name}' needs exactly one of 'command' or 'action'")
+        self.name = name
+        self.command = command
+        self.action = action
+        self.depends_on = tuple(depends_on)
+
+
+class RemediationPlan:
+    """A validated DAG of remediation steps"""
+
+    def __init__(self, name, steps):
+        self.name = name
+        self.steps = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"plan '{name}': duplicate step '{step.name}'")
+            self.steps[step.name] = step
+
+        for step in self.steps.values():
+            for dependency in step.depends_on:
+                if dependency not in self.steps:
+                    raise ValueError(f"plan '{name}': step '{step.name}' depends on unknown step '{dependency}'")
+
+        self.order = self.topological_order()
+        self.dependents = {step_name: [] for step_name in self.steps}
+        for step in self.steps.values():
+            for dependency in step.depends_on:
+                self.dependents[dependency].append(step.name)
+
+    @classmethod
+    def from_config(cls, name, step_configs, compile_command=None):
+        """Build a plan from config dicts: {name, command | action, depends_on}"""
+        if not isinstance(step_configs, list):
+            raise ValueError(f"plan '{name}' must be a list of steps")
+
+        steps = []
+        for step_config in step_configs:
+            if not isinstance(step_config, dict) or "name" not in step_config:
+                raise ValueError(f"plan '{name}': every step needs a 'name'")
+            command = step_config.get("command")
+            if command is not None and compile_command is not None:
+                command = compile_command(command)
+            steps.append(RemediationStep(
+                step_config["name"],
+                command=command,
+                action=step_config.get("action"),
+                depends_on=step_config.get("depends_on", [])
+            ))
+        return cls(name, steps)
+
+    def topological_order(self):
+        """Kahn's algorithm; raises ValueError on cycles"""
+        remaining = {name: len(step.depends_on) for name, step in self.steps.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        order = []
+
+        while ready:
+            current = ready.pop(0)
+            order.append(current)
+            for step in self.steps.values():
+                if current in step.depends_on:
+                    remaining[step.name] -= 1
+                    if remaining[step.name] == 0:
+                        ready.append(step.name)
+
+        if len(order) != len(self.steps):
+            raise ValueError(f"plan '{self.name}' has a dependency cycle")
+        return order
+
+
+def check_plan_recursion(plans):
+    """Raise ValueError if a plan reaches itself through action steps.
+
+    A step whose action names a plan runs that plan, so a plan that invokes
+    itself (directly or via other plans) would wait on its own in-flight run
+    forever. Kahn's algorithm only sees the edges inside one plan.
+    """
+    calls = {name: [step.action for step in plan.steps.values() if step.action in plans]
+             for name, plan in plans.items()}
+    finished = set()
+
+    def visit(name, path):
+        if name in path:
+            cycle = path[path.index(name):] + [name]
+            raise ValueError(f"plan '{name}' invokes itself: {' -> '.join(cycle)}")
+        if name in finished:
+            return
+        for callee in calls[name]:
+            visit(callee, path + [name])
+        finished.add(name)
+
+    for name in plans:
+        visit(name, [])
+
+
+class PlanSchedule:
+    """Dependency bookkeeping for one plan run, shared by the thread and asyncio runners"""
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.statuses = {}
+        self.results = {}
+        self.waiting = {name: set(step.depends_on) for name, step in plan.steps.items()}
+
+    def take_ready(self):
+        """Steps whose dependencies have all succeeded (each returned once)"""
+        ready = [name for name, deps in self.waiting.items() if not deps]
+        for name in ready:
+            del self.waiting[name]
+        return ready
+
+    def complete(self, name, result):
+        self.results[name] = result
+        if result.get("success"):
+            self.statuses[name] = SUCCEEDED
+            for deps in self.waiting.values():
+                deps.discard(name)
+        else:
+            self.statuses[name] = FAILED
+            self.skip_dependents(name)
+
+    def skip_dependents(self, step_name):
+        for dependent in self.plan.dependents[step_name]:
+            if dependent not in self.statuses:
+                self.statuses[dependent] = SKIPPED
+                self.results[dependent] = {"success": False, "skipped": True,
+                                           "message": f"Skipped: dependency '{step_name}' failed"}
+                self.waiting.pop(dependent, None)
+                self.skip_dependents(dependent)
+
+    def outcome(self, start_time):
+        order = self.plan.order
+        return {
+            "success": all(status == SUCCEEDED for status in self.statuses.values()),
+            "execution_time": time.time() - start_time,
+            "statuses": {name: self.statuses[name] for name in order},
+            "steps": {name: self.results[name] for name in order}
+        }
+
+
+class PlanRunner:
+    """Runs a plan's independent steps concurrently on a worker pool.
+
+    run_step(step) must return a result dict with a boolean "success". A failed
+    step marks all of its transitive dependents as skipped. run_async() does the
+    same on the event loop for a coroutine run_step.
+    """
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+
+    def run(self, plan, run_step):
+        start_time = time.time()
+        schedule = PlanSchedule(plan)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            running = {}
+
+            def submit_ready():
+                for name in schedule.take_ready():
+                    running[pool.submit(run_step, plan.steps[name])] = name
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {"success": False, "error": str(e)}
+                    schedule.complete(name, result)
+                submit_ready()
+
+        return schedule.outcome(start_time)
+
+    async def run_async(self, plan, run_step):
+        start_time = time.time()
+        schedule = PlanSchedule(plan)
+        running = {}
+
+        def submit_ready():
+            for name in schedule.take_ready():
+                running[asyncio.ensure_future(run_step(plan.steps[name]))] = name
+
+        submit_ready()
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = {"success": False, "error": str(e)}
+                    schedule.complete(name, result)
+                submit_ready()
+        finally:
+            # A cancelled plan cancels its running steps (and kills their commands)
+            for task in running:
+                task.cancel()
+
+        return schedule.outcome(start_time)
@@ -0,0 +1,173 @@
+import json
+import os
+import random
+import time
+from collections import defaultdict
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXECUTION_LOG = os.path.join(PROJECT_ROOT, "logs", "action_execution.log")
+
+DEFAULT_SUCCESS_RATE = 0.5
+DEFAULT_LATENCY = 1.0
+
+
+class VirtualClock:
+    """Simulated time that only moves when actions 'take' time"""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+        return self.now
+
+
+class ActionModel:
+    """Empirical outcome model for one action: success rate plus latency samples per outcome"""
+
+    def __init__(self, action, success_latencies=None, failure_latencies=None):
+        self.action = action
+        self.success_latencies = list(success_latencies or [])
+        self.failure_latencies = list(failure_latencies or [])
+
+    @property
+    def samples(self):
+        return len(self.success_latencies) + len(self.failure_latencies)
+
+    @property
+    def success_rate(self):
+        if not self.samples:
+            return DEFAULT_SUCCESS_RATE
+        return len(self.success_latencies) / self.samples
+
+    def sample(self, rng):
+        """Draw (success, latency) by resampling the observed executions"""
+        success = rng.random() < self.success_rate
+        latencies = self.success_latencies if success else self.failure_latencies
+        latencies = latencies or self.success_latencies or self.failure_latencies
+        latency = rng.choice(latencies) if latencies else DEFAULT_LATENCY
+        return success, latency
+
+    def summary(self):
+        latencies = sorted(self.success_latencies + self.failure_latencies)
+        return {
+            "samples": self.samples,
+            "success_rate": round(self.success_rate, 3),
+            "median_latency": latencies[len(latencies) // 2] if latencies else None
+        }
+
+
+def fit_action_models(log_path=EXECUTION_LOG):
+    """Fit per-action models from action_execution.log (result + details.execution_time)"""
+    observations = defaultdict(lambda: ([], []))
+
+    if os.path.exists(log_path):
+        with open(log_path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    action = entry["action"]
+                    latency = float(entry.get("details", {}).get("execution_time", DEFAULT_LATENCY))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    continue
+                successes, failures = observations[action]
+                (successes if entry.get("result") else failures).append(latency)
+
+    models = {action: ActionModel(action, s, f) for action, (s, f) in observations.items()}
+    pooled_successes = [l for m in models.values() for l in m.success_latencies]
+    pooled_failures = [l for m in models.values() for l in m.failure_latencies]
+    default_model = ActionModel("*", pooled_successes, pooled_failures)
+    return models, default_model
+
+
+class SimulatedActionExecutor:
+    """Drop-in executor backend that replays fitted latency/failure distributions.
+
+    Exposes execute_action(action, context) with the same result shape as
+    RealActionExecutor, but never touches the host: latency advances a
+    VirtualClock instead of sleeping.
+    """
+
+    def __init__(self, log_path=EXECUTION_LOG, seed=None, clock=None, models=None, log_results=False):
+        if models is None:
+            self.models, self.default_model = fit_action_models(log_path)
+        else:
+            self.models, self.default_model = models, ActionModel("*")
+        self.rng = random.Random(seed)
+        self.clock = clock or VirtualClock()
+        self.log_results = log_results
+        self.execution_log = os.path.join(PROJECT_ROOT, "logs", "simulated_execution.log")
+        self.executions = 0
+        self.successes = 0
+
+    def execute_action(self, action, context=None):
+        context = context or {}
+        service_name = context.get('service', 'default_service')
+        model = self.models.get(action, self.default_model)
+
+        success, latency = model.sample(self.rng)
+        self.clock.advance(latency)
+        self.executions += 1
+        self.successes += success
+
+        result = {
+            "success": success,
+            "execution_time": latency,
+            "message": f"Simulated {action} on {service_name} ({'succeeded' if success else 'failed'})",
+            "simulated": True,
+            "virtual_time": self.clock.time()
+        }
+        if self.log_results:
+            os.makedirs(os.path.dirname(self.execution_log), exist_ok=True)
+            with open(self.execution_log, 'a') as f:
+                f.write(json.dumps({"action": action, "result": success, "details": result}) + "\n")
+        return result
+
+
+def benchmark_pipeline(agent, executor, incidents=10000, scenarios=None, seed=None):
+    """Drive choose -> execute -> update for many incidents without persisting the Q-table"""
+    rng = random.Random(seed)
+    scenarios = scenarios or [
+        {'error_type': 'service_down', 'severity': 'critical', 'service': 'web_server'},
+        {'error_type': 'service_down', 'severity': 'high', 'service': 'api_service'},
+        {'error_type': 'database_connection_lost', 'severity': 'critical', 'service': 'postgres'},
+        {'error_type': 'resource_exhaustion', 'severity': 'critical', 'service': 'web_server',
+         'details': {'memory_usage': '95%'}},
+        {'error_type': 'network_timeout', 'severity': 'high', 'service': 'api_service'}
+    ]
+
+    start_time = time.time()
+    virtual_start = executor.clock.time()
+    successes = 0
+    for _ in range(incidents):
+        issue = rng.choice(scenarios)
+        action = agent.choose_action_enhanced(issue)
+        result = executor.execute_action(action, {'service': issue.get('service', 'unknown')})
+        agent.update_enhanced(issue, action, result['success'], result['execution_time'], persist=False)
+        successes += result['success']
+
+    elapsed = time.time() - start_time
+    return {
+        "incidents": incidents,
+        "elapsed": elapsed,
+        "incidents_per_second": incidents / elapsed if elapsed > 0 else float("inf"),
+        "success_rate": successes / incidents if incidents else 0.0,
+        "virtual_seconds": executor.clock.time() - virtual_start
+    }
+
+
+if __name__ == "__main__":
+    from .advanced_smart_agent import AdvancedSmartAgent
+
+    executor = SimulatedActionExecutor(seed=42)
+    print("📊 Fitted action models:")
+    for action, model in sorted(executor.models.items()):
+        print(f"   {action}: {model.summary()}")
+
+    stats = benchmark_pipeline(AdvancedSmartAgent(), executor, incidents=20000, seed=42)
+    print(f"⚡ {stats['incidents']:,} incidents in {stats['elapsed']:.2f}s "
+          f"({stats['incidents_per_second']:,.0f}/s), success rate {stats['success_rate']:.1%}, "
+          f"{stats['virtual_seconds']:.0f}s of simulated remediation time")
@@ -1,7 +1,9 @@
 import csv
 import os
+import sys
 import json
 from collections import defaultdict
+from types import MappingProxyType
 import random
 
 # Get the directory where this script is located
@@ -12,19 +14,45 @@ RL_TABLE = os.path.join(PROJECT_ROOT, "data", "rl_table.csv")
 STATE_ACTION_FILE = os.path.join(PROJECT_ROOT, "data", "states_actions.json")
 
 class SmartAgent:
-    def __init__(self, alpha=0.6, gamma=0.0, epsilon=0.2):
+    def __init__(self, alpha=0.6, gamma=0.0, epsilon=0.2, exploit_only=False):
         self.alpha = alpha       # learning rate
         self.gamma = gamma       # discount factor
         self.epsilon = epsilon   # exploration rate
+        self.exploit_only = exploit_only  # production mode: greedy lookups only
 
         self.q_table = defaultdict(lambda: defaultdict(float))
         self.state_actions = self.load_state_actions()
         self.load_q_table()
+        self.export_greedy_policy()
 
     # ✅ Load state → action list from YAML
     def load_state_actions(self):
         with open(STATE_ACTION_FILE, "r") as f:
-            return json.load(f)
+            return self.compile_state_actions(json.load(f))
+
+    # ✅ Validate and precompile state → action tuples (interned names)
+    def compile_state_actions(self, config):
+        actions = config.get("actions")
+        if not isinstance(actions, dict):
+            raise ValueError("'actions' must be a mapping of state -> action list")
+
+        compiled = dict(config)
+        compiled["actions"] = {}
+        for state, state_actions in actions.items():
+            if not isinstance(state_actions, list) or not all(isinstance(a, str) for a in state_actions):
+                raise ValueError(f"actions for '{state}' must be a list of strings")
+            compiled["actions"][sys.intern(state)] = tuple(sys.intern(a) for a in state_actions)
+        return compiled
+
+    # ✅ Swap in reloaded state actions and rebuild the greedy policy
+    def apply_state_actions(self, compiled):
+        self.state_actions = compiled
+        self.export_greedy_policy()
+
+    # ✅ Register states_actions.json with a ConfigWatcher for hot reload
+    def watch_config(self, watcher):
+        watcher.watch(STATE_ACTION_FILE, self.compile_state_actions, self.apply_state_actions,
+                      name="states_actions.json")
 
     # ✅ Load existing Q-values from CSV
     def load_q_table(self):
@@ -55,8 +83,34 @@ class SmartAgent:
     def get_actions(self, state):
         return self.state_actions["actions"].get(state, [])
 
+    # ✅ Compile Q-table into a read-only state → best action map
+    # (callers get the MappingProxyType view; only the agent writes the backing dict)
+    def export_greedy_policy(self):
+        greedy_actions = {}
+        for state, actions in self.state_actions["actions"].items():
+            if actions:
+                greedy_actions[state] = max(actions, key=lambda a: self.q_table[state][a])
+        if getattr(self, "_greedy_actions", None) is None:
+            self._greedy_actions = {}
+            self.greedy_policy = MappingProxyType(self._greedy_actions)
+        self._greedy_actions.clear()
+        self._greedy_actions.update(greedy_actions)
+        return self.greedy_policy
+
+    # ✅ Recompute the best action for one state after its values change
+    def refresh_greedy_action(self, state):
+        actions = self.get_actions(state)
+        if actions:
+            self._greedy_actions[state] = max(actions, key=lambda a: self.q_table[state][a])
+
     # ✅ Choose action using epsilon-greedy
     def choose_action(self, state):
+        # fast path: exploit-only mode is a single dict hit
+        if self.exploit_only or self.epsilon <= 0:
+            action = self._greedy_actions.get(state)
+            if action is not None:
+                return action
+
         actions = self.get_actions(state)
 
         if not actions:
@@ -64,7 +118,7 @@ class SmartAgent:
             return None
 
         # explore
-        if random.random() < self.epsilon:
+        if not self.exploit_only and random.random() < self.epsilon:
             return random.choice(actions)
 
         # exploit
@@ -75,14 +129,17 @@ class SmartAgent:
         current_q = self.q_table[state][action]
         new_q = current_q + self.alpha * (reward - current_q)
         self.q_table[state][action] = new_q
+        self.refresh_greedy_action(state)
         self.save_q_table()
 
     # ✅ Human feedback Q-update (manual)
-    def human_update(self, state, action, feedback):
+    def human_update(self, state, action, feedback, persist=True):
         current_q = self.q_table[state][action]
         new_q = current_q + self.alpha * (feedback - current_q)
         self.q_table[state][action] = new_q
-        self.save_q_table()
+        self.refresh_greedy_action(state)
+        if persist:
+            self.save_q_table()
 
 
 # ✅ Test (optional)
@@ -0,0 +1,271 @@
+import os
+import json
+import time
+import numpy as np
+
+from .advanced_smart_agent import (
+    SEVERITY_MULTIPLIERS,
+    IMPACT_MULTIPLIERS,
+    ACTION_EFFICIENCY,
+    DEFAULT_ACTION_EFFICIENCY
+)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIMULATION_CONFIG = os.path.join(PROJECT_ROOT, "config", "simulation_config.json")
+
+DEFAULT_SIMULATION_CONFIG = {
+    "default_action": {"success_prob": 0.5, "latency_median": 1.0, "latency_sigma": 0.5},
+    "user_impact": "medium",
+    "actions": {
+        "clear_port": {"success_prob": 0.9, "latency_median": 0.3},
+        "restart_service": {"success_prob": 0.8, "latency_median": 2.0},
+        "restart_container": {"success_prob": 0.75, "latency_median": 3.0},
+        "rollback_config": {"success_prob": 0.85, "latency_median": 1.5},
+        "check_network": {"success_prob": 0.6, "latency_median": 0.5},
+        "restart_service_graceful": {"success_prob": 0.8, "latency_median": 2.5},
+        "restart_service_force": {"success_prob": 0.85, "latency_median": 1.5},
+        "failover_to_backup": {"success_prob": 0.9, "latency_median": 5.0},
+        "scale_horizontal": {"success_prob": 0.7, "latency_median": 8.0, "latency_sigma": 0.8},
+        "rollback_deployment": {"success_prob": 0.9, "latency_median": 15.0, "latency_sigma": 0.8}
+    },
+    "states": {
+        "port_busy": {
+            "clear_port": {"success_prob": 0.95}
+        },
+        "database_connection_lost": {
+            "reset_connection_pool": {"success_prob": 0.85, "latency_median": 0.5},
+            "restart_database_service": {"success_prob": 0.9, "latency_median": 6.0}
+        }
+    }
+}
+
+
+def load_simulation_config(config_path=SIMULATION_CONFIG):
+    """Load per-action success and latency model for the simulator"""
+    try:
+        os.makedirs(os.path.dirname(config_path), exist_ok=True)
+        if not os.path.exists(config_path):
+            with open(config_path, 'w') as f:
+                json.dump(DEFAULT_SIMULATION_CONFIG, f, indent=2)
+
+        with open(config_path, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Config error: {e}, using defaults")
+        return DEFAULT_SIMULATION_CONFIG
+
+
+class BatchedRemediationEnv:
+    """Headless environment stepping many independent incidents at once.
+
+    Every row of a batch is one incident: a state is drawn, the agent picks an
+    action index, and the outcome (success, latency) is sampled from the
+    configured per-state/per-action model.
+    """
+
+    def __init__(self, actions_by_state, config=None, num_envs=4096, seed=None):
+        self.config = config if config is not None else load_simulation_config()
+        self.num_envs = num_envs
+        self.rng = np.random.default_rng(seed)
+
+        self.states = [s for s, actions in actions_by_state.items() if actions]
+        self.actions = [list(actions_by_state[s]) for s in self.states]
+        self.num_states = len(self.states)
+        self.max_actions = max((len(a) for a in self.actions), default=0)
+        if self.num_states == 0:
+            raise ValueError("No states with actions to simulate")
+
+        shape = (self.num_states, self.max_actions)
+        self.action_counts = np.array([len(a) for a in self.actions], dtype=np.int64)
+        self.action_mask = np.zeros(shape, dtype=bool)
+        self.success_prob = np.zeros(shape)
+        self.latency_log_median = np.zeros(shape)
+        self.latency_sigma = np.zeros(shape)
+
+        for s, state in enumerate(self.states):
+            for a, action in enumerate(self.actions[s]):
+                model = self.action_model(state, action)
+                self.action_mask[s, a] = True
+                self.success_prob[s, a] = model["success_prob"]
+                self.latency_log_median[s, a] = np.log(max(model["latency_median"], 1e-6))
+                self.latency_sigma[s, a] = model["latency_sigma"]
+
+        self.current_states = self.sample_states()
+
+    def action_model(self, state, action):
+        """Resolve the outcome model: state override > action default > global default"""
+        model = dict(DEFAULT_SIMULATION_CONFIG["default_action"])
+        model.update(self.config.get("default_action", {}))
+        model.update(self.config.get("actions", {}).get(action, {}))
+        model.update(self.config.get("states", {}).get(state, {}).get(action, {}))
+        return model
+
+    def sample_states(self):
+        return self.rng.integers(0, self.num_states, size=self.num_envs)
+
+    def reset(self):
+        self.current_states = self.sample_states()
+        return self.current_states
+
+    def step(self, action_idx):
+        """Apply one action per env; returns (states, success, latency, next_states)"""
+        states = self.current_states
+        success = self.rng.random(self.num_envs) < self.success_prob[states, action_idx]
+        latency = np.exp(
+            self.latency_log_median[states, action_idx]
+            + self.latency_sigma[states, action_idx] * self.rng.standard_normal(self.num_envs)
+        )
+        self.current_states = self.sample_states()
+        return states, success, latency, self.current_states
+
+
+class VectorizedTrainer:
+    """Batched Q-learning using the SmartAgent or AdvancedSmartAgent update rule.
+
+    Updates that hit the same (state, action) within one batch are applied in
+    closed form: k updates towards a mean target t give
+    q <- (1 - alpha)^k * q + (1 - (1 - alpha)^k) * t.
+    """
+
+    RULES = ("smart", "advanced")
+
+    def __init__(self, env, rule="smart", alpha=0.6, gamma=0.0, epsilon=0.2,
+                 severities=None, user_impact=None, q_values=None, visit_counts=None, seed=None):
+        if rule not in self.RULES:
+            raise ValueError(f"Unknown update rule: {rule}")
+
+        self.env = env
+        self.rule = rule
+        self.alpha = alpha
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.rng = np.random.default_rng(seed)
+
+        shape = (env.num_states, env.max_actions)
+        self.q = np.zeros(shape) if q_values is None else np.array(q_values, dtype=float)
+        self.visits = np.zeros(shape, dtype=np.int64) if visit_counts is None else np.array(visit_counts, dtype=np.int64)
+
+        # Reward shaping arrays for the advanced rule
+        severities = severities or {}
+        user_impact = user_impact or env.config.get("user_impact", "medium")
+        self.severity_multiplier = np.array(
+            [SEVERITY_MULTIPLIERS.get(severities.get(s, 'medium'), 1.0) for s in env.states]
+        )
+        self.impact_multiplier = IMPACT_MULTIPLIERS.get(user_impact, 1.0)
+        self.action_efficiency = np.ones(shape)
+        for s, actions in enumerate(env.actions):
+            for a, action in enumerate(actions):
+                self.action_efficiency[s, a] = ACTION_EFFICIENCY.get(action, DEFAULT_ACTION_EFFICIENCY)
+
+    @classmethod
+    def from_agent(cls, agent, num_envs=4096, config=None, seed=None):
+        """Build a trainer seeded from an agent's action config and Q-table"""
+        if hasattr(agent, "choose_action_enhanced"):
+            rule = "advanced"
+            actions_by_state = agent.config["actions"]
+            severities = {s: info.get("severity", "medium") for s, info in agent.config.get("states", {}).items()}
+        else:
+            rule = "smart"
+            actions_by_state = agent.state_actions["actions"]
+            severities = None
+
+        env = BatchedRemediationEnv(actions_by_state, config=config, num_envs=num_envs, seed=seed)
+        trainer = cls(env, rule=rule, alpha=agent.alpha, gamma=agent.gamma, epsilon=agent.epsilon,
+                      severities=severities, seed=None if seed is None else seed + 1)
+
+        for s, state in enumerate(env.states):
+            for a, action in enumerate(env.actions[s]):
+                trainer.q[s, a] = agent.q_table[state][action]
+                if rule == "advanced":
+                    trainer.visits[s, a] = agent.state_visit_count.get(f"{state}_{action}", 0)
+        return trainer
+
+    def select_actions(self, states):
+        """Vectorized epsilon-greedy (smart) or epsilon-greedy UCB (advanced)"""
+        mask = self.env.action_mask[states]
+
+        if self.rule == "advanced":
+            visits = self.visits[states]
+            total = np.where(mask, visits, 0).sum(axis=1, keepdims=True)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                confidence = np.sqrt(2 * np.log(total + 1) / visits)
+            scores = np.where(visits == 0, np.inf, self.q[states] + confidence)
+        else:
+            scores = self.q[states].copy()
+
+        scores[~mask] = -np.inf
+        greedy = scores.argmax(axis=1)
+
+        explore = self.rng.random(len(states)) < self.epsilon
+        random_actions = (self.rng.random(len(states)) * self.env.action_counts[states]).astype(np.int64)
+        return np.where(explore, random_actions, greedy)
+
+    def compute_rewards(self, states, actions, success, latency):
+        if self.rule == "smart":
+            return np.where(success, 1.0, -1.0)
+
+        base = np.where(success, 1.0, -1.0)
+        time_penalty = np.minimum(latency * 0.1, 1.0)
+        shaped = (base * self.severity_multiplier[states] * self.impact_multiplier
+                  * self.action_efficiency[states, actions]) - time_penalty
+        return np.maximum(shaped, -2.0)
+
+    def apply_updates(self, states, actions, rewards):
+        """Apply a batch of updates grouped by (state, action)"""
+        if self.rule == "advanced" and self.gamma:
+            masked_q = np.where(self.env.action_mask, self.q, -np.inf)
+            targets = rewards + self.gamma * masked_q.max(axis=1)[states]
+        else:
+            targets = rewards
+
+        flat = states * self.env.max_actions + actions
+        size = self.q.size
+        counts = np.bincount(flat, minlength=size).reshape(self.q.shape)
+        sums = np.bincount(flat, weights=targets, minlength=size).reshape(self.q.shape)
+
+        touched = counts > 0
+        decay = np.power(1.0 - self.alpha, counts[touched])
+        self.q[touched] = decay * self.q[touched] + (1.0 - decay) * (sums[touched] / counts[touched])
+        self.visits += counts
+
+    def run(self, num_steps=100):
+        """Run num_steps batches; returns throughput and reward statistics"""
+        start_time = time.time()
+        reward_curve = np.zeros(num_steps)
+
+        for step in range(num_steps):
+            states = self.env.current_states
+            actions = self.select_actions(states)
+            states, success, latency, _ = self.env.step(actions)
+            rewards = self.compute_rewards(states, actions, success, latency)
+            self.apply_updates(states, actions, rewards)
+            reward_curve[step] = rewards.mean()
+
+        elapsed = time.time() - start_time
+        transitions = num_steps * self.env.num_envs
+        return {
+            "transitions": transitions,
+            "elapsed": elapsed,
+            "transitions_per_minute": transitions / elapsed * 60 if elapsed > 0 else float("inf"),
+            "mean_reward": float(reward_curve.mean()) if num_steps else 0.0,
+            "final_reward": float(reward_curve[-max(1, num_steps // 10):].mean()) if num_steps else 0.0,
+            "reward_curve": reward_curve
+        }
+
+    def greedy_policy(self):
+        """Best action per state under the learned Q-values"""
+        masked_q = np.where(self.env.action_mask, self.q, -np.inf)
+        best = masked_q.argmax(axis=1)
+        return {state: self.env.actions[s][best[s]] for s, state in enumerate(self.env.states)}
+
+    def export_to_agent(self, agent, persist=True):
+        """Write the learned Q-values (and visit counts) back into an agent"""
+        for s, state in enumerate(self.env.states):
+            for a, action in enumerate(self.env.actions[s]):
+                agent.q_table[state][action] = float(self.q[s, a])
+                if self.rule == "advanced":
+                    agent.state_visit_count[f"{state}_{action}"] = int(self.visits[s, a])
+        if hasattr(agent, "export_greedy_policy"):
+            agent.export_greedy_policy()
+        if persist:
+            agent.save_q_table()
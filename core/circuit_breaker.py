@@ -0,0 +1,79 @@
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Probe statuses that mean the target answered, even if unhealthily
+RESPONSIVE_STATUSES = ("healthy", "unhealthy")
+
+
+class ProbeCircuitBreakers:
+    """Per-target circuit breakers for probes that keep timing out.
+
+    After `threshold` consecutive timed-out probes a target's circuit opens:
+    it is not probed and its last-known result is reported instead. Once the
+    backoff elapses, one half-open probe (with a short timeout) is allowed. If
+    the target answers at all - healthy or an error response such as HTTP 503
+    - the circuit closes and the health tracker judges the answer; a timeout or
+    connection failure reopens it with the backoff doubled up to max_backoff.
+    Fast failures such as connection refused do not count towards opening,
+    since they cost no sweep time.
+    """
+
+    def __init__(self, threshold=3, backoff=30, max_backoff=300, half_open_timeout=1.0, clock=time.monotonic):
+        self.threshold = threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.half_open_timeout = half_open_timeout
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.circuits = {}
+
+    def entry(self, key):
+        return self.circuits.setdefault(key, {"state": CLOSED, "timeouts": 0, "backoff": self.backoff,
+                                              "retry_at": None, "last_result": None})
+
+    def before_probe(self, key):
+        """Decide how to probe a target: CLOSED (normally), HALF_OPEN (short check) or OPEN (skip)"""
+        with self.lock:
+            circuit = self.entry(key)
+            if circuit["state"] == OPEN and self.clock() >= circuit["retry_at"]:
+                circuit["state"] = HALF_OPEN
+            return circuit["state"]
+
+    def last_known(self, key):
+        """Last real probe result, annotated with the open circuit"""
+        with self.lock:
+            circuit = self.entry(key)
+            result = dict(circuit["last_result"] or {"status": "unreachable"})
+            result["circuit_open"] = True
+            result["retry_in"] = max(0.0, circuit["retry_at"] - self.clock())
+            return result
+
+    def record(self, key, result, healthy):
+        """Update a circuit with a real probe result; returns the new state"""
+        with self.lock:
+            circuit = self.entry(key)
+            circuit["last_result"] = result
+
+            responded = healthy or (result.get("status") in RESPONSIVE_STATUSES and not result.get("timed_out"))
+            if healthy or (circuit["state"] == HALF_OPEN and responded):
+                circuit.update(state=CLOSED, timeouts=0, backoff=self.backoff, retry_at=None)
+                return CLOSED
+
+            if circuit["state"] == HALF_OPEN:
+                circuit["backoff"] = min(circuit["backoff"] * 2, self.max_backoff)
+                circuit.update(state=OPEN, retry_at=self.clock() + circuit["backoff"])
+                return OPEN
+
+            circuit["timeouts"] = circuit["timeouts"] + 1 if result.get("timed_out") else 0
+            if circuit["timeouts"] >= self.threshold:
+                circuit.update(state=OPEN, retry_at=self.clock() + circuit["backoff"])
+                print(f"⛔ Circuit opened for {key}: {circuit['timeouts']} consecutive probe timeouts")
+            return circuit["state"]
+
+    def summary(self):
+        with self.lock:
+            return {key: circuit["state"] for key, circuit in self.circuits.items()}
@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+
+
+class ConfigWatcher:
+    """Polls config files for changes and hot-swaps their compiled form.
+
+    Each watched file has a compile function (parse result -> compiled object,
+    raising on invalid config) and an apply function that installs the
+    compiled object with a single reference swap. Parsing and compiling happen
+    on the watcher thread, so readers never pay for them. Change detection uses
+    the file's mtime and size (portable, no inotify dependency).
+    """
+
+    def __init__(self, interval=2.0):
+        self.interval = interval
+        self.watches = {}
+        self.lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def file_signature(self, path):
+        try:
+            stat = os.stat(path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def load_json(self, path):
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def watch(self, path, compile_fn, apply_fn, name=None, parser=None):
+        """Register a file; the current version is assumed to be loaded already.
+
+        parser(path) reads the file (JSON by default).
+        """
+        with self.lock:
+            self.watches[path] = {
+                "name": name or os.path.basename(path),
+                "parse": parser or self.load_json,
+                "compile": compile_fn,
+                "apply": apply_fn,
+                "signature": self.file_signature(path)
+            }
+
+    def reload(self, path):
+        """Parse, validate and swap in one file; returns True on success"""
+        watch = self.watches[path]
+        try:
+            compiled = watch["compile"](watch["parse"](path))
+        except Exception as e:
+            print(f"⚠️ Config reload rejected for {watch['name']}: {e} (keeping previous version)")
+            return False
+
+        watch["apply"](compiled)
+        print(f"🔁 Config reloaded: {watch['name']}")
+        return True
+
+    def check_now(self):
+        """Reload every watched file whose signature changed; returns the reloaded paths"""
+        reloaded = []
+        with self.lock:
+            watches = list(self.watches.items())
+
+        for path, watch in watches:
+            signature = self.file_signature(path)
+            if signature is None or signature == watch["signature"]:
+                continue
+            # Record the signature even when invalid so a bad file is reported once
+            watch["signature"] = signature
+            if self.reload(path):
+                reloaded.append(path)
+        return reloaded
+
+    def start(self):
+        """Start the background polling thread"""
+        if self._thread and self._thread.is_alive():
+            return self._thread
+
+        def poll():
+            while not self._stop_event.wait(self.interval):
+                try:
+                    self.check_now()
+                except Exception as e:
+                    print(f"❌ Config watcher error: {e}")
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=poll, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop_event.set()
@@ -0,0 +1,65 @@
+import threading
+import time
+
+HEALTHY = "healthy"
+SUSPECT = "suspect"
+DOWN = "down"
+RECOVERING = "recovering"
+
+
+class HealthStateTracker:
+    """Per-target health state machine with hysteresis.
+
+    healthy -> suspect on the first failed probe, suspect -> down after
+    failure_threshold consecutive failures (a success in between returns to
+    healthy). down -> recovering on the first success, recovering -> healthy
+    after recovery_threshold consecutive successes (a failure drops back to
+    down). record() returns the transition only when the state changes.
+    """
+
+    def __init__(self, failure_threshold=2, recovery_threshold=2, clock=time.time):
+        self.failure_threshold = failure_threshold
+        self.recovery_threshold = recovery_threshold
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.targets = {}
+
+    def state(self, key):
+        entry = self.targets.get(key)
+        return entry["state"] if entry else HEALTHY
+
+    def record(self, key, healthy):
+        """Feed one probe result; returns (old_state, new_state, entry) or None if unchanged"""
+        with self.lock:
+            entry = self.targets.setdefault(key, {"state": HEALTHY, "streak": 0, "since": self.clock(),
+                                                  "down_since": None})
+            old_state = entry["state"]
+
+            # streak counts consecutive failures while healthy/suspect and
+            # consecutive successes while down/recovering
+            if old_state in (HEALTHY, SUSPECT):
+                entry["streak"] = 0 if healthy else entry["streak"] + 1
+                new_state = SUSPECT if entry["streak"] else HEALTHY
+                if entry["streak"] >= self.failure_threshold:
+                    new_state = DOWN
+            else:
+                entry["streak"] = entry["streak"] + 1 if healthy else 0
+                new_state = RECOVERING if entry["streak"] else DOWN
+                if entry["streak"] >= self.recovery_threshold:
+                    new_state = HEALTHY
+
+            if new_state in (HEALTHY, DOWN):
+                entry["streak"] = 0
+            if new_state == old_state:
+                return None
+
+            now = self.clock()
+            if new_state == DOWN and old_state != RECOVERING:
+                entry["down_since"] = now
+            entry["state"] = new_state
+            entry["since"] = now
+            return old_state, new_state, dict(entry)
+
+    def summary(self):
+        with self.lock:
+            return {key: entry["state"] for key, entry in self.targets.items()}
@@ -0,0 +1,225 @@
+import http.client
+import ipaddress
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Optional requests import
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    requests = None
+    HTTPAdapter = None
+    REQUESTS_AVAILABLE = False
+
+# Errors from a keep-alive connection the server already closed; anything else
+# (notably a timeout) is the target's answer and must not be retried
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                           ConnectionResetError, BrokenPipeError)
+
+
+class DnsCache:
+    """Caches hostname -> addresses lookups for ttl seconds (ttl <= 0 disables caching).
+
+    Every address getaddrinfo returns is kept, in its order, so callers can
+    fall back to the next one (e.g. 127.0.0.1 after ::1 refuses). prefer()
+    moves an address that worked to the front for later lookups.
+    """
+
+    def __init__(self, ttl=30.0, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def resolve_all(self, host, port):
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+
+        if self.ttl > 0:
+            with self.lock:
+                entry = self.entries.get((host, port))
+                if entry is not None and entry[1] > self.clock():
+                    return list(entry[0])
+
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        if self.ttl > 0:
+            with self.lock:
+                self.entries[(host, port)] = (addresses, self.clock() + self.ttl)
+        return list(addresses)
+
+    def resolve(self, host, port):
+        return self.resolve_all(host, port)[0]
+
+    def prefer(self, host, port, address):
+        """Try address first next time (no-op if it is not cached)"""
+        with self.lock:
+            entry = self.entries.get((host, port))
+            if entry is not None and entry[0][0] != address and address in entry[0]:
+                addresses = [address] + [a for a in entry[0] if a != address]
+                self.entries[(host, port)] = (addresses, entry[1])
+
+
+class HttpProbeClient:
+    """Keep-alive HTTP client for health probes, shared across sweeps.
+
+    With requests installed, probes go through one Session whose HTTPAdapter
+    keeps a connection pool per host. Without it, idle http.client connections
+    are pooled per (scheme, host, port) and reused. Plain-http hostnames are
+    resolved through a TTL DNS cache and the request is sent to the cached
+    addresses in turn with the original Host header; https keeps the
+    hostname so certificate checks still work.
+    """
+
+    def __init__(self, timeout=5.0, pool_size=10, dns_ttl=30.0):
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.dns = DnsCache(dns_ttl)
+        self.lock = threading.Lock()
+        self.idle = {}
+
+        self.session = None
+        if REQUESTS_AVAILABLE:
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+
+    def resolve_targets(self, url):
+        """Return [(request url, Host header or None)] to try in order, one per cached address of http URLs"""
+        parts = urlsplit(url)
+        if parts.scheme != "http" or not parts.hostname:
+            return [(url, None)]
+
+        port = parts.port or 80
+        addresses = self.dns.resolve_all(parts.hostname, port)
+        if addresses == [parts.hostname]:
+            return [(url, None)]
+
+        targets = []
+        for address in addresses:
+            host = f"[{address}]" if ":" in address else address
+            targets.append((parts._replace(netloc=f"{host}:{port}").geturl(), parts.netloc))
+        return targets
+
+    def check(self, url, timeout=None):
+        """Probe url; returns a health result dict (healthy / unhealthy / failed)"""
+        start_time = time.monotonic()
+        try:
+            status_code = self.get_status(url, timeout or self.timeout)
+        except Exception as e:
+            result = {"status": "failed", "error": str(e)}
+            if self.is_timeout(e):
+                result["timed_out"] = True
+            return result
+
+        if status_code == 200:
+            return {"status": "healthy", "response_time": time.monotonic() - start_time}
+        return {"status": "unhealthy", "error": f"HTTP {status_code}"}
+
+    def is_timeout(self, error):
+        if isinstance(error, (socket.timeout, TimeoutError)):
+            return True
+        return REQUESTS_AVAILABLE and isinstance(error, requests.exceptions.Timeout)
+
+    def get_status(self, url, timeout):
+        """GET url, moving on to the next resolved address when a connection is refused"""
+        targets = self.resolve_targets(url)
+        for attempt, (request_url, host_header) in enumerate(targets):
+            headers = {"Host": host_header} if host_header else {}
+            try:
+                status = self.get_status_once(request_url, headers, timeout)
+            except Exception as e:
+                # A timeout already spent the budget; only fast failures try another address
+                if attempt == len(targets) - 1 or self.is_timeout(e) or not self.is_connect_error(e):
+                    raise
+                continue
+
+            if host_header:
+                parts = urlsplit(url)
+                self.dns.prefer(parts.hostname, parts.port or 80, urlsplit(request_url).hostname)
+            return status
+
+    def get_status_once(self, url, headers, timeout):
+        if self.session is not None:
+            response = self.session.get(url, headers=headers, timeout=timeout)
+            response.close()
+            return response.status_code
+
+        return self.get_status_http_client(url, headers, timeout)
+
+    def is_connect_error(self, error):
+        if REQUESTS_AVAILABLE and isinstance(error, requests.exceptions.ConnectionError):
+            return True
+        return isinstance(error, OSError)
+
+    def get_status_http_client(self, url, headers, timeout):
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        connection = self.take_idle(key)
+        reused = connection is not None
+        if connection is None:
+            connection = self.new_connection(parts, timeout)
+        elif connection.sock is not None:
+            connection.sock.settimeout(timeout)
+
+        try:
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (http.client.HTTPException, OSError) as e:
+            connection.close()
+            if not reused or not isinstance(e, STALE_CONNECTION_ERRORS):
+                raise
+            # The server closed an idle keep-alive connection; retry once on a fresh one
+            connection = self.new_connection(parts, timeout)
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+            except Exception:
+                connection.close()
+                raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            self.release(key, connection)
+        return response.status
+
+    def new_connection(self, parts, timeout):
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        return connection_class(parts.hostname, parts.port, timeout=timeout)
+
+    def take_idle(self, key):
+        with self.lock:
+            connections = self.idle.get(key)
+            return connections.pop() if connections else None
+
+    def release(self, key, connection):
+        with self.lock:
+            connections = self.idle.setdefault(key, [])
+            if len(connections) < self.pool_size:
+                connections.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        with self.lock:
+            for connections in self.idle.values():
+                for connection in connections:
+                    connection.close()
+            self.idle.clear()
+        if self.session is not None:
+            self.session.close()
@@ -0,0 +1,132 @@
+import json
+import math
+import os
+import threading
+from array import array
+
+
+class LatencySketch:
+    """Streaming quantile sketch with bounded relative error (log-spaced buckets).
+
+    A sample x lands in bucket ceil(log_gamma(x)), so every quantile is
+    answered within relative_accuracy of the true value while memory grows
+    only with the spread of latencies, not the number of samples.
+    """
+
+    def __init__(self, relative_accuracy=0.01, min_value=1e-6):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.buckets = {}
+        self.count = 0
+
+    def add(self, value):
+        index = math.ceil(math.log(max(value, self.min_value)) / self.log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return None
+
+
+class LatencyRing:
+    """Fixed-size ring buffer of the most recent samples"""
+
+    def __init__(self, size=128):
+        self.samples = array("d", [0.0] * size)
+        self.size = size
+        self.position = 0
+        self.filled = 0
+
+    def add(self, value):
+        self.samples[self.position] = value
+        self.position = (self.position + 1) % self.size
+        self.filled = min(self.filled + 1, self.size)
+
+    def values(self):
+        if self.filled < self.size:
+            return list(self.samples[:self.filled])
+        return list(self.samples[self.position:]) + list(self.samples[:self.position])
+
+    def quantile(self, q):
+        values = sorted(self.values())
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class LatencyTracker:
+    """Per-service probe latencies: recent window plus a long-run baseline sketch.
+
+    A service is degraded when the recent p95 exceeds both
+    degradation_factor x the baseline p95 and min_degraded_latency. Samples
+    taken while degraded stay out of the baseline so it does not drift up to
+    meet the slowdown. record() returns True/False when the degraded flag
+    flips and None otherwise.
+    """
+
+    def __init__(self, window=128, degradation_factor=2.0, min_degraded_latency=0.2, min_samples=20):
+        self.window = window
+        self.degradation_factor = degradation_factor
+        self.min_degraded_latency = min_degraded_latency
+        self.min_samples = min_samples
+        self.lock = threading.Lock()
+        self.services = {}
+
+    def record(self, service, latency):
+        with self.lock:
+            entry = self.services.get(service)
+            if entry is None:
+                entry = self.services[service] = {"recent": LatencyRing(self.window),
+                                                  "baseline": LatencySketch(), "degraded": False}
+            entry["recent"].add(latency)
+
+            degraded = self.is_degraded(entry)
+            if not degraded:
+                entry["baseline"].add(latency)
+            if degraded == entry["degraded"]:
+                return None
+            entry["degraded"] = degraded
+            return degraded
+
+    def is_degraded(self, entry):
+        if entry["recent"].filled < self.min_samples or entry["baseline"].count < self.min_samples:
+            return False
+        recent_p95 = entry["recent"].quantile(0.95)
+        baseline_p95 = entry["baseline"].quantile(0.95)
+        return recent_p95 > max(baseline_p95 * self.degradation_factor, self.min_degraded_latency)
+
+    def stats(self, service):
+        with self.lock:
+            entry = self.services.get(service)
+            if entry is None:
+                return None
+            baseline, recent = entry["baseline"], entry["recent"]
+            return {
+                "samples": baseline.count,
+                "p50": baseline.quantile(0.50),
+                "p95": baseline.quantile(0.95),
+                "p99": baseline.quantile(0.99),
+                "recent_p50": recent.quantile(0.50),
+                "recent_p95": recent.quantile(0.95),
+                "degraded": entry["degraded"]
+            }
+
+    def snapshot(self):
+        return {service: self.stats(service) for service in list(self.services)}
+
+    def export_json(self, path):
+        """Write the snapshot atomically so readers never see a partial file"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp_path, path)
@@ -0,0 +1,105 @@
+import heapq
+import random
+import threading
+import time
+
+
+class ProbeScheduler:
+    """Min-heap of per-target probe deadlines with adaptive intervals.
+
+    Every target starts at base_interval. A failed probe halves its interval
+    (down to min_interval); the first success after a failure keeps it at
+    min_interval so recovery is confirmed quickly; each further success grows
+    it by relax_factor up to max_interval. Each delay gets +/- jitter so
+    targets that share an interval spread out instead of firing together.
+    """
+
+    def __init__(self, base_interval=30, min_interval=5, max_interval=60, jitter=0.1,
+                 tighten_factor=0.5, relax_factor=1.5, clock=time.monotonic, rng=None):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.tighten_factor = tighten_factor
+        self.relax_factor = relax_factor
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.lock = threading.Lock()
+        self.heap = []
+        self.targets = {}
+        self.probes_scheduled = 0
+
+    def jittered(self, interval):
+        return interval * (1 + self.rng.uniform(-self.jitter, self.jitter))
+
+    def add(self, key, target, delay=0.0):
+        """Register a target; the first probe is due after delay (spread by jitter)"""
+        with self.lock:
+            self.targets[key] = {"target": target, "interval": self.base_interval,
+                                 "healthy": None, "generation": 0}
+            heapq.heappush(self.heap, (self.clock() + delay * self.rng.random(), 0, key))
+
+    def remove(self, key):
+        with self.lock:
+            self.targets.pop(key, None)
+
+    def next_due(self):
+        """Time of the earliest pending probe (None when nothing is scheduled)"""
+        with self.lock:
+            self.discard_stale()
+            return self.heap[0][0] if self.heap else None
+
+    def discard_stale(self):
+        while self.heap:
+            _, generation, key = self.heap[0]
+            entry = self.targets.get(key)
+            if entry is not None and entry["generation"] == generation:
+                return
+            heapq.heappop(self.heap)
+
+    def pop_due(self, now=None):
+        """Remove and return [(key, target)] for every probe due at or before now"""
+        now = self.clock() if now is None else now
+        due = []
+        with self.lock:
+            self.discard_stale()
+            while self.heap and self.heap[0][0] <= now:
+                _, _, key = heapq.heappop(self.heap)
+                due.append((key, self.targets[key]["target"]))
+                self.discard_stale()
+        return due
+
+    def record(self, key, healthy):
+        """Reschedule a probed target based on its result; returns the new interval"""
+        with self.lock:
+            entry = self.targets.get(key)
+            if entry is None:
+                return None
+
+            if not healthy:
+                interval = max(self.min_interval, entry["interval"] * self.tighten_factor)
+            elif entry["healthy"] is False:
+                interval = self.min_interval
+            else:
+                interval = min(self.max_interval, entry["interval"] * self.relax_factor)
+
+            entry["interval"] = interval
+            entry["healthy"] = healthy
+            entry["generation"] += 1
+            self.probes_scheduled += 1
+            heapq.heappush(self.heap, (self.clock() + self.jittered(interval), entry["generation"], key))
+            return interval
+
+    def reschedule(self, key, delay=None):
+        """Put a popped target back without judging it (defaults to its current interval)"""
+        with self.lock:
+            entry = self.targets.get(key)
+            if entry is None:
+                return
+            entry["generation"] += 1
+            delay = entry["interval"] if delay is None else delay
+            heapq.heappush(self.heap, (self.clock() + self.jittered(delay), entry["generation"], key))
+
+    def intervals(self):
+        with self.lock:
+            return {key: entry["interval"] for key, entry in self.targets.items()}
@@ -0,0 +1,104 @@
+import os
+import signal
+import time
+
+
+class ProcessTable:
+    """Snapshot of the Linux process table built from a single /proc walk.
+
+    One refresh() reads /proc/<pid>/comm and /proc/<pid>/cmdline for every
+    process and indexes them, so any number of process checks per sweep cost
+    one directory walk instead of one pgrep fork/exec each. Processes that
+    exit mid-walk are skipped.
+    """
+
+    def __init__(self, proc_root="/proc"):
+        self.proc_root = proc_root
+        self.by_name = {}
+        self.cmdlines = {}
+        self.argvs = {}
+        self.scanned_at = None
+
+    @property
+    def available(self):
+        return os.path.isdir(os.path.join(self.proc_root, "self"))
+
+    def read_file(self, pid, name):
+        with open(os.path.join(self.proc_root, pid, name), "rb") as f:
+            return f.read()
+
+    def refresh(self):
+        """Walk /proc once and rebuild the name -> pids and pid -> cmdline indexes"""
+        by_name = {}
+        cmdlines = {}
+        argvs = {}
+
+        for entry in os.scandir(self.proc_root):
+            if not entry.name.isdigit():
+                continue
+            try:
+                comm = self.read_file(entry.name, "comm").decode(errors="replace").strip()
+                raw_cmdline = self.read_file(entry.name, "cmdline")
+            except OSError:
+                continue
+            pid = int(entry.name)
+            argv = [arg.decode(errors="replace") for arg in raw_cmdline.split(b"\0") if arg]
+            by_name.setdefault(comm, []).append(pid)
+            cmdlines[pid] = " ".join(argv)
+            argvs[pid] = argv
+
+        self.by_name = by_name
+        self.cmdlines = cmdlines
+        self.argvs = argvs
+        self.scanned_at = time.monotonic()
+        return self
+
+    def refresh_if_older(self, max_age):
+        if self.scanned_at is None or time.monotonic() - self.scanned_at > max_age:
+            self.refresh()
+        return self
+
+    def find(self, name):
+        """PIDs whose process name matches (exact name first, then substring like pgrep)"""
+        pids = self.by_name.get(name)
+        if pids:
+            return list(pids)
+        return sorted(pid for comm, comm_pids in self.by_name.items() if name in comm for pid in comm_pids)
+
+    def find_by_cmdline(self, pattern):
+        """PIDs whose argv contains pattern's words as whole arguments, in order (pgrep -f on word boundaries).
+
+        An argument matches a word exactly or by its basename, so "nginx" finds
+        /usr/sbin/nginx but not nginx-exporter. PID 1, this process and its
+        parent are never returned. Raises ValueError for an empty pattern,
+        which would otherwise match everything.
+        """
+        words = pattern.split() if isinstance(pattern, str) else []
+        if not words:
+            raise ValueError(f"Refusing to match processes on an empty pattern: {pattern!r}")
+
+        excluded = {1, os.getpid(), os.getppid()}
+        return sorted(pid for pid, argv in self.argvs.items()
+                      if pid not in excluded and self.argv_matches(argv, words))
+
+    @staticmethod
+    def argv_matches(argv, words):
+        names = [os.path.basename(arg) for arg in argv]
+        for start in range(len(argv) - len(words) + 1):
+            if all(word in (argv[start + i], names[start + i]) for i, word in enumerate(words)):
+                return True
+        return False
+
+    def signal(self, pattern, sig=signal.SIGHUP):
+        """Send sig to every process find_by_cmdline matches (pkill -f).
+
+        Returns the list of PIDs actually signalled.
+        """
+        signalled = []
+        for pid in self.find_by_cmdline(pattern):
+            try:
+                os.kill(pid, sig)
+                signalled.append(pid)
+            except (ProcessLookupError, PermissionError):
+                continue
+        return signalled
@@ -1,17 +1,57 @@
 import subprocess
-import socket
 import time
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 
-# Optional requests import
-try:
-    import requests
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    requests = None
-    REQUESTS_AVAILABLE = False
+from .circuit_breaker import ProbeCircuitBreakers, OPEN, HALF_OPEN
+from .health_state import HealthStateTracker, DOWN, HEALTHY, RECOVERING
+from .http_probe import HttpProbeClient
+from .latency_tracker import LatencyTracker
+from .probe_scheduler import ProbeScheduler
+from .process_table import ProcessTable
+from .tcp_probe import TcpProbeEngine
+
+
+# Sweep scheduling: probes run concurrently and a sweep never outlasts its deadline
+DEFAULT_MONITORING = {
+    "interval": 30,
+    "min_interval": 5,
+    "max_interval": 120,
+    "jitter": 0.1,
+    "failure_threshold": 2,
+    "recovery_threshold": 2,
+    "latency_window": 128,
+    "degradation_factor": 2.0,
+    "min_degraded_latency": 0.2,
+    "latency_min_samples": 20,
+    "latency_export_interval": 60,
+    "breaker_threshold": 3,
+    "breaker_backoff": 30,
+    "breaker_max_backoff": 300,
+    "half_open_timeout": 1.0,
+    "probe_timeout": 5,
+    "sweep_deadline": 8,
+    "max_workers": 32,
+    "http_pool_size": 10,
+    "tcp_max_in_flight": 1024,
+    "dns_ttl": 30
+}
+
+# Issue raised for each unhealthy check type
+CHECK_ISSUES = {
+    "http": ("service_down", "critical"),
+    "tcp": ("port_unreachable", "high"),
+    "process": ("process_down", "critical"),
+    "latency": ("latency_degraded", "high")
+}
+
+# Service types probe_targets knows how to check
+PROBE_TYPES = ("http", "tcp")
+
+# Result status for probes that never ran before the sweep deadline
+NOT_CHECKED = "not_checked"
 
 class RealDeploymentMonitor:
     def __init__(self, bus):
@@ -20,6 +60,33 @@ class RealDeploymentMonitor:
         self.config_file = os.path.join(self.project_root, "config", "deployment_config.json")
         self.load_deployment_config()
         
+        # One /proc walk per sweep answers every process check (Linux only)
+        self.process_table = ProcessTable()
+        self.use_process_table = os.name != 'nt' and self.process_table.available
+        
+        self.monitoring = dict(DEFAULT_MONITORING)
+        self.monitoring.update(self.config.get('monitoring', {}))
+        self.probe_timeout = self.monitoring['probe_timeout']
+        # Keep-alive connections and resolved addresses are reused across sweeps
+        self.http_probe = HttpProbeClient(self.probe_timeout, self.monitoring['http_pool_size'],
+                                          self.monitoring['dns_ttl'])
+        self.tcp_probe = TcpProbeEngine(self.probe_timeout, self.monitoring['tcp_max_in_flight'],
+                                        self.http_probe.dns)
+        # Targets that keep timing out are skipped and re-checked on a backoff
+        self.breakers = ProbeCircuitBreakers(self.monitoring['breaker_threshold'], self.monitoring['breaker_backoff'],
+                                             self.monitoring['breaker_max_backoff'],
+                                             self.monitoring['half_open_timeout'])
+        # Issues are published on state transitions, not on every failed probe
+        self.health_states = HealthStateTracker(self.monitoring['failure_threshold'],
+                                                self.monitoring['recovery_threshold'])
+        # Probe latencies: recent window + percentile sketch per service
+        self.latency = LatencyTracker(self.monitoring['latency_window'], self.monitoring['degradation_factor'],
+                                      self.monitoring['min_degraded_latency'], self.monitoring['latency_min_samples'])
+        self.latency_stats_file = os.path.join(self.project_root, "logs", "latency_stats.json")
+        self.latency_exported_at = time.monotonic()
+        self.check_pool = ThreadPoolExecutor(max_workers=self.monitoring['max_workers'],
+                                             thread_name_prefix="health-check")
+        
     def load_deployment_config(self):
         """Load real deployment endpoints and services to monitor"""
         default_config = {
@@ -38,7 +105,8 @@ class RealDeploymentMonitor:
                 {"name": "app_logs", "path": "logs/app.log"},
                 {"name": "error_logs", "path": "logs/error.log"},
                 {"name": "nginx_logs", "path": "/var/log/nginx/error.log"}
-            ]
+            ],
+            "monitoring": DEFAULT_MONITORING
         }
         
         try:
@@ -53,40 +121,31 @@ class RealDeploymentMonitor:
             print(f"Config error: {e}, using defaults")
             self.config = default_config
 
-    def check_http_service(self, service):
+    def check_http_service(self, service, timeout=None):
         """Check HTTP service health"""
-        if not REQUESTS_AVAILABLE:
-            return {"status": "skipped", "error": "requests module not available"}
-        
-        try:
-            response = requests.get(service['url'], timeout=5)
-            if response.status_code == 200:
-                return {"status": "healthy", "response_time": response.elapsed.total_seconds()}
-            else:
-                return {"status": "unhealthy", "error": f"HTTP {response.status_code}"}
-        except requests.exceptions.RequestException as e:
-            return {"status": "failed", "error": str(e)}
-        except Exception as e:
-            return {"status": "failed", "error": str(e)}
+        return self.http_probe.check(service['url'], timeout)
 
-    def check_tcp_service(self, service):
+    def check_tcp_service(self, service, timeout=None):
         """Check TCP service connectivity"""
+        return self.check_tcp_services([service], timeout)[0]
+
+    def check_tcp_services(self, services, timeout=None):
+        """Check many TCP endpoints at once with non-blocking connects on one thread"""
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5)
-            result = sock.connect_ex((service['host'], service['port']))
-            sock.close()
-            
-            if result == 0:
-                return {"status": "healthy", "port": service['port']}
-            else:
-                return {"status": "unreachable", "error": f"Port {service['port']} closed"}
+            return self.tcp_probe.probe_many([(service['host'], service['port']) for service in services], timeout)
         except Exception as e:
-            return {"status": "failed", "error": str(e)}
+            return [{"status": "failed", "error": str(e)} for _ in services]
 
     def check_process_status(self, process_config):
         """Check if system process is running"""
         try:
+            if self.use_process_table:
+                # Reuses this sweep's snapshot; a standalone call gets a fresh one
+                pids = self.process_table.refresh_if_older(1.0).find(process_config["process"])
+                if pids:
+                    return {"status": "running", "process": process_config["process"], "pids": pids}
+                return {"status": "stopped", "process": process_config["process"]}
+            
             if os.name == 'nt':  # Windows
                 cmd = f'tasklist /FI "IMAGENAME eq {process_config["process"]}.exe"'
             else:  # Linux/Mac
@@ -101,61 +160,193 @@ class RealDeploymentMonitor:
         except Exception as e:
             return {"status": "error", "error": str(e)}
 
+    def build_issue(self, check_type, name, result):
+        error_type, severity = CHECK_ISSUES[check_type]
+        return {
+            'error_type': error_type,
+            'service': name,
+            'details': result,
+            'severity': severity,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def probe_targets(self, services, processes):
+        """Probe the given services and processes concurrently.
+
+        HTTP probes run on a bounded thread pool, all TCP endpoints go through
+        one selector-based engine call, and process checks are answered from
+        the /proc snapshot. Probes still running at the sweep
+        deadline are reported as timed out, so a sweep takes at most
+        sweep_deadline seconds however many endpoints are configured.
+        Probes that never got a worker before the deadline are reported as
+        "not_checked" and say nothing about the target's health.
+        Targets with an open circuit are not probed; their last-known
+        result is reported instead. Returns [(check_type, config, result)].
+        """
+        deadline = time.monotonic() + self.monitoring['sweep_deadline']
+        results = []
+
+        # Each future yields a list of results for its list of services
+        futures = {}
+        tcp_batches = {}
+        for service in services:
+            circuit = self.breakers.before_probe(service['name'])
+            if circuit == OPEN:
+                results.append((service['type'], service, self.breakers.last_known(service['name'])))
+                continue
+            timeout = self.breakers.half_open_timeout if circuit == HALF_OPEN else None
+            
+            if service['type'] == 'http':
+                future = self.check_pool.submit(lambda s=service, t=timeout: [self.check_http_service(s, t)])
+                futures[future] = [service]
+            elif service['type'] == 'tcp':
+                tcp_batches.setdefault(timeout, []).append(service)
+        for timeout, tcp_services in tcp_batches.items():
+            futures[self.check_pool.submit(self.check_tcp_services, tcp_services, timeout)] = tcp_services
+
+        # Check system processes while network probes are in flight
+        if self.use_process_table and processes:
+            self.process_table.refresh()
+        for process in processes:
+            results.append(('process', process, self.check_process_status(process)))
+
+        done, pending = wait(futures, timeout=max(0, deadline - time.monotonic()))
+        for future, batch in futures.items():
+            if future in done:
+                try:
+                    batch_results = future.result()
+                except Exception as e:
+                    batch_results = [{"status": "failed", "error": str(e)} for _ in batch]
+            elif future.cancel():
+                batch_results = [{"status": NOT_CHECKED,
+                                  "error": f"Not started before the sweep deadline ({self.monitoring['sweep_deadline']}s)"}
+                                 for _ in batch]
+            else:
+                batch_results = [{"status": "timeout", "timed_out": True,
+                                  "error": f"No response within sweep deadline ({self.monitoring['sweep_deadline']}s)"}
+                                 for _ in batch]
+            for service, result in zip(batch, batch_results):
+                if self.was_probed(result):
+                    self.breakers.record(service['name'], result, self.is_healthy(service['type'], result))
+                results.append((service['type'], service, result))
+
+        return results
+
+    def is_healthy(self, check_type, result):
+        return result['status'] == ('running' if check_type == 'process' else 'healthy')
+
+    def was_probed(self, result):
+        """False for probes that never ran or failed locally (e.g. out of sockets) - they say nothing about the target"""
+        return result['status'] != NOT_CHECKED and not result.get('local_error')
+
+    def run_health_sweep(self):
+        """Probe every endpoint once and return the detected issues"""
+        results = self.probe_targets(self.config.get('services', []), self.config.get('system_processes', []))
+        return [
+            self.build_issue(check_type, target['name'], result)
+            for check_type, target, result in results
+            if self.was_probed(result) and not self.is_healthy(check_type, result)
+        ]
+
+    def build_probe_scheduler(self):
+        """Schedule every configured service and process with its own adaptive interval"""
+        monitoring = self.monitoring
+        scheduler = ProbeScheduler(
+            base_interval=monitoring['interval'],
+            min_interval=monitoring['min_interval'],
+            max_interval=monitoring['max_interval'],
+            jitter=monitoring['jitter']
+        )
+        # First probes are spread over the opening seconds rather than fired at once
+        for service in self.config.get('services', []):
+            if service.get('type') not in PROBE_TYPES:
+                print(f"⚠️ Not monitoring {service.get('name')}: unsupported probe type {service.get('type')!r}")
+                continue
+            scheduler.add(('service', service['name']), service, delay=monitoring['min_interval'])
+        for process in self.config.get('system_processes', []):
+            scheduler.add(('process', process['name']), process, delay=monitoring['min_interval'])
+        return scheduler
+
+    def publish_transition(self, check_type, name, result, transition):
+        """Publish an issue when a target goes down and an event when it recovers"""
+        old_state, new_state, entry = transition
+        if new_state == DOWN and old_state != RECOVERING:
+            issue = self.build_issue(check_type, name, result)
+            print(f"🚨 REAL DEPLOYMENT ISSUE: {issue}")
+            self.bus.publish("deployment.issue.detected", issue)
+        elif new_state == HEALTHY and old_state in (DOWN, RECOVERING):
+            recovery = {
+                'service': name,
+                'check_type': check_type,
+                'details': result,
+                'downtime': entry['since'] - entry['down_since'],
+                'timestamp': datetime.now().isoformat()
+            }
+            print(f"✅ {name} recovered after {recovery['downtime']:.0f}s")
+            self.bus.publish("deployment.recovered", recovery)
+
+    def record_latency(self, name, latency):
+        """Track a probe latency; publish an issue when the service turns slow"""
+        degraded = self.latency.record(name, latency)
+        if degraded:
+            issue = self.build_issue('latency', name, self.latency.stats(name))
+            print(f"🐢 LATENCY DEGRADATION: {issue}")
+            self.bus.publish("deployment.issue.detected", issue)
+        elif degraded is False:
+            print(f"✅ {name} latency back to normal")
+
+    def export_latency_stats(self):
+        try:
+            self.latency.export_json(self.latency_stats_file)
+        except OSError as e:
+            print(f"Latency export error: {e}")
+        self.latency_exported_at = time.monotonic()
+
     def monitor_deployment_health(self):
         """Continuously monitor real deployment health"""
         print("🔍 Starting real deployment monitoring...")
+        self.scheduler = self.build_probe_scheduler()
         
         while True:
-            deployment_issues = []
+            due = self.scheduler.pop_due()
+            if due:
+                services = [target for (kind, _), target in due if kind == 'service']
+                processes = [target for (kind, _), target in due if kind == 'process']
+                
+                unprobed = {key for key, _ in due}
+                for check_type, target, result in self.probe_targets(services, processes):
+                    kind = 'process' if check_type == 'process' else 'service'
+                    unprobed.discard((kind, target['name']))
+                    if not self.was_probed(result):
+                        if result.get('local_error'):
+                            print(f"⚠️ Could not probe {target['name']}: {result['error']}")
+                        # Try again next round without touching its interval or health state
+                        self.scheduler.reschedule((kind, target['name']), self.monitoring['min_interval'])
+                        continue
+                    
+                    healthy = self.is_healthy(check_type, result)
+                    self.scheduler.record((kind, target['name']), healthy)
+                    
+                    transition = self.health_states.record((kind, target['name']), healthy)
+                    if transition is not None:
+                        self.publish_transition(check_type, target['name'], result, transition)
+                    
+                    latency = result.get('response_time', result.get('latency'))
+                    if healthy and latency is not None:
+                        self.record_latency(target['name'], latency)
+                
+                # Anything that produced no result keeps its place in the schedule
+                for key in unprobed:
+                    self.scheduler.reschedule(key, self.scheduler.base_interval)
+                
+                if time.monotonic() - self.latency_exported_at >= self.monitoring['latency_export_interval']:
+                    self.export_latency_stats()
             
-            # Check HTTP services
-            for service in self.config.get('services', []):
-                if service['type'] == 'http':
-                    result = self.check_http_service(service)
-                    if result['status'] != 'healthy':
-                        issue = {
-                            'error_type': 'service_down',
-                            'service': service['name'],
-                            'details': result,
-                            'severity': 'critical',
-                            'timestamp': datetime.now().isoformat()
-                        }
-                        deployment_issues.append(issue)
-                        
-                elif service['type'] == 'tcp':
-                    result = self.check_tcp_service(service)
-                    if result['status'] != 'healthy':
-                        issue = {
-                            'error_type': 'port_unreachable',
-                            'service': service['name'],
-                            'details': result,
-                            'severity': 'high',
-                            'timestamp': datetime.now().isoformat()
-                        }
-                        deployment_issues.append(issue)
-            
-            # Check system processes
-            for process in self.config.get('system_processes', []):
-                result = self.check_process_status(process)
-                if result['status'] != 'running':
-                    issue = {
-                        'error_type': 'process_down',
-                        'service': process['name'],
-                        'details': result,
-                        'severity': 'critical',
-                        'timestamp': datetime.now().isoformat()
-                    }
-                    deployment_issues.append(issue)
-            
-            # Publish real deployment issues
-            for issue in deployment_issues:
-                print(f"🚨 REAL DEPLOYMENT ISSUE: {issue}")
-                self.bus.publish("deployment.issue.detected", issue)
-            
-            if not deployment_issues:
-                print("✅ All services healthy")
-            
-            time.sleep(30)  # Check every 30 seconds
+            next_due = self.scheduler.next_due()
+            if next_due is None:
+                time.sleep(self.monitoring['interval'])
+            else:
+                time.sleep(max(0.0, next_due - time.monotonic()))
 
     def simulate_real_failure(self, failure_type):
         """Simulate real deployment failures for testing"""
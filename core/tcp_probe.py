@@ -0,0 +1,133 @@
+import errno
+import os
+import selectors
+import socket
+import time
+from collections import deque
+
+from .http_probe import DnsCache
+
+IN_PROGRESS = (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY)
+# The target (or the route to it) answered; another address may still work
+REMOTE_ERRORS = (errno.ECONNREFUSED, errno.ENETUNREACH, errno.EHOSTUNREACH, errno.ETIMEDOUT)
+
+
+class TcpProbeEngine:
+    """Checks many host:port endpoints concurrently on one thread.
+
+    Each endpoint gets a non-blocking socket and connect_ex(); completion is
+    multiplexed with the platform selector (epoll on Linux) and SO_ERROR tells
+    whether the connection was accepted; a refused address falls back to the
+    next one the DNS cache holds within the same deadline. Up to max_in_flight
+    connects are open at once, so thousands of endpoints finish within one
+    timeout window as long as they fit in that budget. Results keep the order of the endpoints.
+    """
+
+    def __init__(self, timeout=5.0, max_in_flight=1024, dns_cache=None):
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.dns = dns_cache or DnsCache()
+
+    def probe(self, host, port, timeout=None):
+        return self.probe_many([(host, port)], timeout)[0]
+
+    def probe_many(self, endpoints, timeout=None):
+        """Probe [(host, port)]; returns one result dict per endpoint"""
+        timeout = self.timeout if timeout is None else timeout
+        results = [None] * len(endpoints)
+        queue = deque(enumerate(endpoints))
+
+        with selectors.DefaultSelector() as selector:
+            while queue or selector.get_map():
+                while queue and len(selector.get_map()) < self.max_in_flight:
+                    index, (host, port) = queue.popleft()
+                    self.start_connect(selector, index, host, port, timeout, results)
+
+                now = time.monotonic()
+                pending = [key.data[1] for key in selector.get_map().values()]
+                if not pending:
+                    continue
+
+                for key, _ in selector.select(max(0.0, min(pending) - now)):
+                    index, deadline, started, port, host, addresses = key.data
+                    error = key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    self.finish(selector, key.fileobj)
+                    if error == 0:
+                        results[index] = {"status": "healthy", "port": port,
+                                          "latency": time.monotonic() - started}
+                        self.dns.prefer(host, port, addresses[0])
+                    elif error in REMOTE_ERRORS:
+                        # Refused on this address; the rest share what is left of the deadline
+                        self.connect_next(selector, index, host, port, addresses[1:], deadline, results, error)
+                    else:
+                        results[index] = self.local_failure(port, error)
+
+                # Anything past its own deadline has timed out
+                now = time.monotonic()
+                for key in list(selector.get_map().values()):
+                    index, deadline, _, port = key.data[:4]
+                    if now >= deadline:
+                        results[index] = {"status": "unreachable", "timed_out": True,
+                                          "error": f"Port {port} timed out after {timeout}s"}
+                        self.finish(selector, key.fileobj)
+
+        return results
+
+    def start_connect(self, selector, index, host, port, timeout, results):
+        try:
+            addresses = self.dns.resolve_all(host, port)
+        except OSError as e:
+            results[index] = {"status": "failed", "error": str(e)}
+            return
+        self.connect_next(selector, index, host, port, addresses, time.monotonic() + timeout, results)
+
+    def connect_next(self, selector, index, host, port, addresses, deadline, results, error=None):
+        """Connect to the first address that is not refused; the rest are fallbacks.
+
+        Only remote answers (refused, no route) move on to the next address.
+        A local failure such as EMFILE or EADDRNOTAVAIL says nothing about the
+        target, so it ends the probe as "failed" with local_error set.
+        """
+        while addresses and time.monotonic() < deadline:
+            address = addresses[0]
+            try:
+                family = socket.AF_INET6 if ":" in address else socket.AF_INET
+                sock = socket.socket(family, socket.SOCK_STREAM)
+            except OSError as e:
+                results[index] = self.local_failure(port, e.errno)
+                return
+
+            sock.setblocking(False)
+            started = time.monotonic()
+            error = sock.connect_ex((address, port))
+            if error == 0:
+                results[index] = {"status": "healthy", "port": port, "latency": time.monotonic() - started}
+                self.dns.prefer(host, port, address)
+                sock.close()
+                return
+            if error in IN_PROGRESS:
+                selector.register(sock, selectors.EVENT_WRITE, (index, deadline, started, port, host, addresses))
+                return
+            sock.close()
+            if error not in REMOTE_ERRORS:
+                results[index] = self.local_failure(port, error)
+                return
+            addresses = addresses[1:]
+
+        if error is None:
+            results[index] = {"status": "unreachable", "timed_out": True,
+                              "error": f"Port {port} timed out"}
+        elif error == errno.ECONNREFUSED:
+            results[index] = {"status": "unreachable",
+                              "error": f"Port {port} closed ({errno.errorcode[error]})"}
+        else:
+            results[index] = {"status": "unreachable",
+                              "error": f"Port {port} unreachable ({errno.errorcode.get(error, error)})"}
+
+    def local_failure(self, port, error):
+        return {"status": "failed", "local_error": True,
+                "error": f"Could not probe port {port}: {errno.errorcode.get(error, error)} ({os.strerror(error) if error else 'unknown'})"}
+
+    def finish(self, selector, sock):
+        selector.unregister(sock)
+        sock.close()
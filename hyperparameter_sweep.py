@@ -0,0 +1,189 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from agents.training_env import BatchedRemediationEnv, VectorizedTrainer, load_simulation_config
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+REPORT_DIR = os.path.join(PROJECT_ROOT, "logs")
+
+ACTION_FILES = {
+    "smart": os.path.join(PROJECT_ROOT, "data", "states_actions.json"),
+    "advanced": os.path.join(PROJECT_ROOT, "data", "enhanced_states_actions.json")
+}
+
+DEFAULT_GRID = {
+    "alpha": [0.05, 0.1, 0.3, 0.6],
+    "gamma": [0.0, 0.5, 0.95],
+    "epsilon": [0.01, 0.05, 0.1, 0.2]
+}
+
+# Parameters each update rule actually reads; the smart rule has no discount term
+AGENT_PARAMETERS = {
+    "smart": ("alpha", "epsilon"),
+    "advanced": ("alpha", "gamma", "epsilon")
+}
+UNUSED_PARAMETER_VALUE = 0.0
+
+
+def load_action_space(agent_type):
+    """Read the state -> actions mapping (and severities) used by an agent type"""
+    with open(ACTION_FILES[agent_type], "r") as f:
+        config = json.load(f)
+
+    severities = None
+    if agent_type == "advanced":
+        severities = {s: info.get("severity", "medium") for s, info in config.get("states", {}).items()}
+    return config["actions"], severities
+
+
+def convergence_step(reward_curve, window=10, tolerance=0.05):
+    """First step at which the rolling mean reward is within tolerance of the final reward"""
+    if len(reward_curve) < window:
+        return len(reward_curve)
+
+    rolling = np.convolve(reward_curve, np.ones(window) / window, mode="valid")
+    final = rolling[-1]
+    threshold = final - max(abs(final) * tolerance, 0.01)
+    reached = np.nonzero(rolling >= threshold)[0]
+    return int(reached[0] + window - 1) if len(reached) else len(reward_curve)
+
+
+def evaluate_config(agent_type, alpha, gamma, epsilon, num_envs, steps, seeds, sim_config):
+    """Train from scratch with one parameter set over several seeds (runs in a worker process)"""
+    actions_by_state, severities = load_action_space(agent_type)
+    final_rewards, mean_rewards, converge_steps = [], [], []
+
+    for seed in range(seeds):
+        env = BatchedRemediationEnv(actions_by_state, config=sim_config, num_envs=num_envs, seed=seed)
+        trainer = VectorizedTrainer(env, rule=agent_type, alpha=alpha, gamma=gamma, epsilon=epsilon,
+                                    severities=severities, seed=seed + 10_000)
+        stats = trainer.run(steps)
+        final_rewards.append(stats["final_reward"])
+        mean_rewards.append(stats["mean_reward"])
+        converge_steps.append(convergence_step(stats["reward_curve"]))
+
+    return {
+        "alpha": alpha,
+        "gamma": gamma,
+        "epsilon": epsilon,
+        "final_reward": float(np.mean(final_rewards)),
+        "final_reward_std": float(np.std(final_rewards)),
+        "mean_reward": float(np.mean(mean_rewards)),
+        "convergence_step": float(np.mean(converge_steps)),
+        "convergence_transitions": int(np.mean(converge_steps) * num_envs)
+    }
+
+
+def build_configs(mode, grid, samples, seed=None, agent_type="advanced"):
+    """Expand a full grid or draw random samples from the grid's ranges.
+
+    Parameters the agent's update rule ignores are pinned to a single value
+    and duplicate configurations are dropped, so no run is wasted.
+    """
+    used = AGENT_PARAMETERS[agent_type]
+    grid = {name: values if name in used else [UNUSED_PARAMETER_VALUE] for name, values in grid.items()}
+
+    if mode == "grid":
+        configs = itertools.product(grid["alpha"], grid["gamma"], grid["epsilon"])
+    else:
+        rng = random.Random(seed)
+        configs = [
+            tuple(round(rng.uniform(min(grid[name]), max(grid[name])), 4) for name in ("alpha", "gamma", "epsilon"))
+            for _ in range(samples)
+        ]
+    return list(dict.fromkeys(configs))
+
+
+def write_report(agent_type, results):
+    """Write the ranked results as CSV and JSON under logs/"""
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    csv_path = os.path.join(REPORT_DIR, f"hyperparameter_sweep_{agent_type}.csv")
+    json_path = os.path.join(REPORT_DIR, f"hyperparameter_sweep_{agent_type}.json")
+
+    fields = ["rank", "alpha", "gamma", "epsilon", "final_reward", "final_reward_std",
+              "mean_reward", "convergence_step", "convergence_transitions"]
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(results)
+
+    with open(json_path, "w") as f:
+        json.dump({"agent": agent_type, "generated": time.time(), "results": results}, f, indent=2)
+
+    return csv_path, json_path
+
+
+def run_sweep(agent_type="smart", mode="grid", grid=None, samples=32, num_envs=2048,
+              steps=200, seeds=3, workers=None, seed=None):
+    """Evaluate every configuration across a process pool and return the ranked results"""
+    grid = grid or DEFAULT_GRID
+    configs = build_configs(mode, grid, samples, seed, agent_type)
+    sim_config = load_simulation_config()
+    workers = workers or os.cpu_count() or 1
+
+    print(f"🔬 Sweeping {len(configs)} {agent_type} configurations on {workers} workers...")
+    start_time = time.time()
+    results = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(evaluate_config, agent_type, alpha, gamma, epsilon, num_envs, steps, seeds, sim_config)
+            for alpha, gamma, epsilon in configs
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            results.append(future.result())
+            if done % max(1, len(futures) // 10) == 0:
+                print(f"   {done}/{len(futures)} configurations evaluated")
+
+    # Rank by final reward, then by how quickly it was reached
+    results.sort(key=lambda r: (-r["final_reward"], r["convergence_step"]))
+    for rank, result in enumerate(results, 1):
+        result["rank"] = rank
+
+    csv_path, _ = write_report(agent_type, results)
+    print(f"✅ Sweep finished in {time.time() - start_time:.1f}s - report: {csv_path}")
+    for result in results[:5]:
+        print(f"   #{result['rank']} alpha={result['alpha']} gamma={result['gamma']} "
+              f"epsilon={result['epsilon']} → final reward {result['final_reward']:.3f}, "
+              f"converged at step {result['convergence_step']:.0f}")
+    return results
+
+
+def parse_values(text):
+    return [float(v) for v in text.split(",") if v.strip()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel hyperparameter sweep for the RL agents")
+    parser.add_argument("--agent", choices=["smart", "advanced"], default="smart")
+    parser.add_argument("--mode", choices=["grid", "random"], default="grid")
+    parser.add_argument("--samples", type=int, default=32, help="configurations for random mode")
+    parser.add_argument("--alpha", type=parse_values, default=DEFAULT_GRID["alpha"])
+    parser.add_argument("--gamma", type=parse_values, default=DEFAULT_GRID["gamma"])
+    parser.add_argument("--epsilon", type=parse_values, default=DEFAULT_GRID["epsilon"])
+    parser.add_argument("--envs", type=int, default=2048, help="parallel episodes per step")
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--seeds", type=int, default=3, help="repeats per configuration")
+    parser.add_argument("--workers", type=int, default=None, help="defaults to all cores")
+    parser.add_argument("--seed", type=int, default=None, help="seed for random sampling")
+    args = parser.parse_args()
+
+    run_sweep(
+        agent_type=args.agent,
+        mode=args.mode,
+        grid={"alpha": args.alpha, "gamma": args.gamma, "epsilon": args.epsilon},
+        samples=args.samples,
+        num_envs=args.envs,
+        steps=args.steps,
+        seeds=args.seeds,
+        workers=args.workers,
+        seed=args.seed
+    )
@@ -8,21 +8,37 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from core.sovereign_bus import SovereignBus
 from core.real_deployment_monitor import RealDeploymentMonitor
+from core.config_watcher import ConfigWatcher
 from agents.advanced_smart_agent import AdvancedSmartAgent
 from agents.real_action_executor import RealActionExecutor
+from agents.simulated_executor import SimulatedActionExecutor
 
 class ProductionIntelligentSystem:
-    def __init__(self):
+    def __init__(self, shard_by_service=False, executor_backend="real"):
         print("🚀 Initializing Production Intelligent System...")
         
         # Core components
         self.bus = SovereignBus()
         self.deployment_monitor = RealDeploymentMonitor(self.bus)
-        self.smart_agent = AdvancedSmartAgent()
-        self.action_executor = RealActionExecutor()
+        self.smart_agent = AdvancedSmartAgent(shard_by_service=shard_by_service)
+        # "simulated" replays fitted latency/failure models instead of touching the host
+        if executor_backend == "simulated":
+            self.action_executor = SimulatedActionExecutor()
+        else:
+            self.action_executor = RealActionExecutor()
+        
+        # Hot-reload action configs without restarting
+        self.config_watcher = ConfigWatcher()
+        self.smart_agent.watch_config(self.config_watcher)
+        if hasattr(self.action_executor, "watch_config"):
+            self.action_executor.watch_config(self.config_watcher)
+        self.smart_agent.watch_merged_snapshot(self.config_watcher)
+        self.config_watcher.start()
         
         # Performance tracking
         self.total_issues_handled = 0
+        self.issues_received = 0
+        self.shared_outcomes = 0
         self.successful_resolutions = 0
         self.start_time = time.time()
         
@@ -32,13 +48,14 @@ class ProductionIntelligentSystem:
     def setup_event_handlers(self):
         """Setup real deployment event handlers"""
         self.bus.subscribe("deployment.issue.detected", self.handle_real_deployment_issue)
+        self.bus.subscribe("deployment.recovered", self.handle_deployment_recovered)
         print("✅ Event handlers configured for real deployment monitoring")
     
     def handle_real_deployment_issue(self, issue_data):
         """Handle real deployment issues with advanced RL"""
-        self.total_issues_handled += 1
+        self.issues_received += 1
         
-        print(f"\n🚨 REAL DEPLOYMENT ISSUE #{self.total_issues_handled}")
+        print(f"\n🚨 REAL DEPLOYMENT ISSUE #{self.issues_received}")
         print(f"   Type: {issue_data.get('error_type', 'unknown')}")
         print(f"   Service: {issue_data.get('service', 'unknown')}")
         print(f"   Severity: {issue_data.get('severity', 'unknown')}")
@@ -59,10 +76,22 @@ class ProductionIntelligentSystem:
         
         execution_result = self.action_executor.execute_action(action, execution_context)
         execution_time = time.time() - start_time
+        if execution_result.get('simulated') and 'virtual_time' in execution_result:
+            execution_time = execution_result['execution_time']
         
         print(f"🔧 Real Execution Result: {execution_result['success']}")
         print(f"⏱️  Execution Time: {execution_time:.2f}s")
         
+        # A coalesced or cached result belongs to a remediation that ran for another
+        # request; only that run updates the agent and the success metrics
+        if execution_result.get('coalesced') or execution_result.get('cached'):
+            self.shared_outcomes += 1
+            source = "in-flight" if execution_result.get('coalesced') else "recent cached"
+            print(f"🔁 Shared outcome of a {source} {action} run - no RL update")
+            return
+        
+        self.total_issues_handled += 1
+        
         # Update RL agent with real results and reward shaping
         shaped_reward = self.smart_agent.update_enhanced(
             issue_data, 
@@ -90,6 +119,15 @@ class ProductionIntelligentSystem:
         }
         self.bus.publish("issue.resolved", resolution_data)
     
+    def handle_deployment_recovered(self, recovery_data):
+        """A service is healthy again: its next failure is a new incident"""
+        service = recovery_data.get('service', 'unknown')
+        print(f"\n✅ RECOVERED: {service} (down {recovery_data.get('downtime', 0):.0f}s)")
+        
+        result_cache = getattr(self.action_executor, 'result_cache', None)
+        if result_cache is not None:
+            result_cache.invalidate(service)
+    
     def display_performance_metrics(self):
         """Display real-time performance metrics"""
         if self.total_issues_handled > 0:
@@ -98,6 +136,7 @@ class ProductionIntelligentSystem:
             
             print(f"\n📊 SYSTEM PERFORMANCE METRICS")
             print(f"   Issues Handled: {self.total_issues_handled}")
+            print(f"   Shared Outcomes (not re-run): {self.shared_outcomes}")
             print(f"   Success Rate: {success_rate:.1f}%")
             print(f"   System Uptime: {uptime/60:.1f} minutes")
             
@@ -1,24 +1,38 @@
-import random
-import time
-from agents.planner_agent import PlannerAgent
-
-# Possible error states (same as your YAML)
-error_states = [
-    "port_busy",
-    "api_down",
-    "config_error",
-    "container_crash",
-    "network_issue"
-]
-
-def simulate_errors(runs=30):
-    planner = PlannerAgent()
-
-    for i in range(runs):
-        state = random.choice(error_states)
-        print(f"\n======= Test Run {i+1} / {runs} =======")
-        planner.handle_event(state)
-        time.sleep(0.5)
+import argparse
+
+from agents.smart_agent import SmartAgent
+from agents.advanced_smart_agent import AdvancedSmartAgent
+from agents.training_env import VectorizedTrainer
+
+
+def simulate_training(agent_type="smart", num_envs=4096, steps=500, seed=None, save=True):
+    """Train an agent offline against the batched simulation environment"""
+    agent = AdvancedSmartAgent() if agent_type == "advanced" else SmartAgent()
+    trainer = VectorizedTrainer.from_agent(agent, num_envs=num_envs, seed=seed)
+
+    print(f"🧪 Training {agent_type} agent: {num_envs} parallel episodes x {steps} steps")
+    stats = trainer.run(steps)
+
+    print(f"⚡ Transitions: {stats['transitions']:,} in {stats['elapsed']:.2f}s "
+          f"({stats['transitions_per_minute']:,.0f}/min)")
+    print(f"🏆 Mean reward: {stats['mean_reward']:.3f} | Final reward: {stats['final_reward']:.3f}")
+    for state, action in trainer.greedy_policy().items():
+        print(f"   {state} → {action}")
+
+    if save:
+        trainer.export_to_agent(agent)
+        print("✅ RL Table Updated")
+
+    return stats
+
 
 if __name__ == "__main__":
-    simulate_errors(30)  # 30 simulations (change if needed)
+    parser = argparse.ArgumentParser(description="Headless vectorized RL training")
+    parser.add_argument("--agent", choices=["smart", "advanced"], default="smart")
+    parser.add_argument("--envs", type=int, default=4096, help="parallel episodes per step")
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--no-save", action="store_true", help="do not write the Q-table")
+    args = parser.parse_args()
+
+    simulate_training(args.agent, args.envs, args.steps, args.seed, save=not args.no_save)
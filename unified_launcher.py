@@ -70,7 +70,14 @@ class UnifiedSystemLauncher:
                 # Try to import and run planner
                 try:
                     from agents.planner_agent import PlannerAgent
-                    planner = PlannerAgent()
+                    # Production decisions are greedy lookups; learning still refreshes the policy
+                    planner = PlannerAgent(exploit_only=True)
+                    # Feedback arrives without blocking the planner loop
+                    planner.feedback.start_file_drop_source()
+                    try:
+                        planner.feedback.start_http_source(port=8765)
+                    except OSError as e:
+                        print(f"⚠️ Feedback HTTP source unavailable ({e}) - continuing without it")
                     # Simulate planner running
                     while True:
                         time.sleep(10)
@@ -202,6 +209,7 @@ class UnifiedSystemLauncher:
         print("- Main Web Dashboard: http://localhost:8080")
         print("- Streamlit Dashboard: http://localhost:8501")
         print("- API Endpoint: http://localhost:8080/api/data")
+        print("- Feedback Endpoint: POST http://localhost:8765/feedback")
     
     def launch_all_systems(self):
         """Launch all system components"""